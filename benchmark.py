@@ -0,0 +1,250 @@
+"""
+效能測試工具
+用於量測翻譯更新流程中各步驟的速度
+
+用法:
+    python benchmark.py forum [頁面1.html ...] [-n 次數]
+    python benchmark.py imports [-m 模組] [-n 次數] [--top 筆數]
+    python benchmark.py download [--size MB] [-n 次數]
+"""
+
+import argparse
+import functools
+import hashlib
+import http.server
+import logging
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from translator import extract_download_link, stream_extract_download_link, stream_to_file, FORUM_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# 已保存的論壇頁面（直接的 Google Drive 連結與 redir.php 轉址連結），forum 未指定頁面時使用
+FORUM_FIXTURES_DIR = Path(__file__).resolve().parent / "tests" / "fixtures" / "forum"
+
+
+def _iter_chunks(data: bytes, chunk_size: int):
+    """模擬 HTTP 回應的 iter_content，將資料切成固定大小的區塊"""
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+def _time_call(func, repeat: int) -> tuple[float, object]:
+    """執行 repeat 次並回傳平均耗時（秒）與最後一次的結果"""
+    result = None
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def bench_forum(pages: list[Path], repeat: int) -> bool:
+    """比較 BeautifulSoup 完整解析與串流擷取的速度，並確認兩者結果一致"""
+    all_match = True
+    for page in pages:
+        data = page.read_bytes()
+
+        soup_time, soup_link = _time_call(
+            lambda: extract_download_link(data.decode('utf-8', errors='replace')), repeat
+        )
+        stream_time, stream_link = _time_call(
+            lambda: stream_extract_download_link(_iter_chunks(data, FORUM_CHUNK_SIZE)), repeat
+        )
+
+        match = soup_link == stream_link
+        all_match = all_match and match
+        speedup = soup_time / stream_time if stream_time > 0 else float('inf')
+
+        print(f"{page.name} ({len(data)} bytes)")
+        print(f"  BeautifulSoup: {soup_time * 1000:8.2f} ms")
+        print(f"  串流擷取:      {stream_time * 1000:8.2f} ms  ({speedup:.1f}x)")
+        print(f"  連結: {stream_link}")
+        if not match:
+            print(f"  結果不一致! BeautifulSoup: {soup_link}")
+        print()
+
+    return all_match
+
+
+def _import_times(module: str) -> dict[str, tuple[int, int]]:
+    """在新的 Python 程序中以 -X importtime 載入模組，回傳 {模組: (自身微秒, 累計微秒)}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=Path(__file__).resolve().parent,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"無法載入 {module}")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time:       self [us] |  cumulative | imported package
+        m = re.match(r'import time:\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(.+)$', line)
+        if m:
+            times[m.group(3).strip()] = (int(m.group(1)), int(m.group(2)))
+    return times
+
+
+def bench_imports(module: str, repeat: int, top: int) -> bool:
+    """量測載入模組的時間，依最上層套件彙總並列出自身耗時最多的模組（取多次中的最小值）"""
+    try:
+        runs = [_import_times(module) for _ in range(repeat)]
+    except RuntimeError as e:
+        print(f"載入失敗: {e}")
+        return False
+
+    best = {}
+    for times in runs:
+        for name, (self_us, cumulative_us) in times.items():
+            if name not in best or cumulative_us < best[name][1]:
+                best[name] = (self_us, cumulative_us)
+
+    packages = {}
+    for name, (self_us, _) in best.items():
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + self_us
+
+    total = best.get(module, (0, 0))[1]
+    print(f"載入 {module}: {total / 1000:.1f} ms（{repeat} 次取最小值，共 {len(best)} 個模組）")
+    print()
+    print("依套件彙總（自身耗時）:")
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        share = self_us / total * 100 if total else 0
+        print(f"  {package:<30} {self_us / 1000:8.2f} ms  {share:5.1f}%")
+    print()
+    print("自身耗時最多的模組:")
+    for name, (self_us, cumulative_us) in sorted(best.items(), key=lambda item: item[1][0], reverse=True)[:top]:
+        print(f"  {name:<40} {self_us / 1000:8.2f} ms（累計 {cumulative_us / 1000:.2f} ms）")
+    return True
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    """不輸出存取記錄的靜態檔案伺服器"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _download_baseline(response, path: Path, total_size: int) -> None:
+    """舊版的下載迴圈：8 KiB 區塊，每個區塊都計算進度並格式化除錯訊息"""
+    sha = hashlib.sha256()
+    downloaded_size = 0
+    with open(path, 'wb') as f:
+        for chunk in response.iter_content(chunk_size=8192):
+            if chunk:
+                f.write(chunk)
+                sha.update(chunk)
+                downloaded_size += len(chunk)
+                if total_size > 0:
+                    percentage = (downloaded_size / total_size) * 100
+                    logger.debug(f"下載進度: {percentage:.1f}%")
+
+
+def _download_tuned(response, path: Path, total_size: int) -> None:
+    """目前的下載方式：預先配置檔案、自動調整讀取大小、依時間節流的進度回報"""
+    sha = hashlib.sha256()
+    with open(path, 'wb') as f:
+        f.truncate(total_size)
+        stream_to_file(
+            lambda n: response.raw.read(n, decode_content=True),
+            f, sha, 0, total_size, lambda *progress: None,
+        )
+
+
+def bench_download(size_mb: int, repeat: int) -> bool:
+    """從本機 HTTP 伺服器下載 size_mb MB 的檔案，比較舊版與目前下載迴圈的速度"""
+    import requests
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        source = temp_dir / "package.bin"
+        with open(source, 'wb') as f:
+            block = os.urandom(1024 * 1024)
+            for _ in range(size_mb):
+                f.write(block)
+        total_size = source.stat().st_size
+
+        handler = functools.partial(_QuietHandler, directory=str(temp_dir))
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/package.bin"
+
+        print(f"本機伺服器檔案: {total_size / 1024 / 1024:.0f} MB")
+        results = {}
+        try:
+            with requests.Session() as session:
+                for name, download in (("舊版 (8 KiB)", _download_baseline), ("目前", _download_tuned)):
+                    best = float('inf')
+                    for _ in range(repeat):
+                        target = temp_dir / "download.part"
+                        started = time.perf_counter()
+                        with session.get(url, stream=True) as response:
+                            response.raise_for_status()
+                            download(response, target, total_size)
+                        best = min(best, time.perf_counter() - started)
+                        if target.stat().st_size != total_size:
+                            print(f"  {name}: 下載大小不符")
+                            return False
+                        target.unlink()
+                    results[name] = best
+                    print(f"  {name:<12} {total_size / best / 1024 / 1024:8.1f} MB/s  ({best:.2f} 秒)")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    baseline, tuned = results.values()
+    print(f"  加速: {baseline / tuned:.1f}x")
+    return True
+
+
+def main() -> bool:
+    parser = argparse.ArgumentParser(description="Deadlock 翻譯更新工具效能測試")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    forum_parser = subparsers.add_parser("forum", help="比較論壇頁面連結擷取方式")
+    forum_parser.add_argument("pages", nargs="*", type=Path, help="已保存的論壇頁面 HTML 檔案（預設為 tests/fixtures/forum 中的頁面）")
+    forum_parser.add_argument("-n", "--repeat", type=int, default=20, help="每個頁面重複次數")
+
+    imports_parser = subparsers.add_parser("imports", help="量測模組載入時間")
+    imports_parser.add_argument("-m", "--module", default="translator", help="要載入的模組（預設 translator）")
+    imports_parser.add_argument("-n", "--repeat", type=int, default=5, help="重複次數，取最小值")
+    imports_parser.add_argument("--top", type=int, default=15, help="列出的筆數")
+
+    download_parser = subparsers.add_parser("download", help="比較下載迴圈的速度（本機 HTTP 伺服器）")
+    download_parser.add_argument("--size", type=int, default=300, help="測試檔案大小（MB）")
+    download_parser.add_argument("-n", "--repeat", type=int, default=3, help="重複次數，取最快的一次")
+
+    args = parser.parse_args()
+
+    # 效能測試時不需要擷取過程的日誌
+    logging.basicConfig(level=logging.ERROR)
+
+    print("=" * 50)
+    print(f"效能測試: {args.command}")
+    print("=" * 50)
+
+    if args.command == "forum":
+        return bench_forum(args.pages or sorted(FORUM_FIXTURES_DIR.glob("*.html")), args.repeat)
+    if args.command == "imports":
+        return bench_imports(args.module, args.repeat, args.top)
+    if args.command == "download":
+        return bench_download(args.size, args.repeat)
+    return False
+
+
+if __name__ == "__main__":
+    try:
+        sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    except Exception:
+        pass
+
+    success = main()
+    sys.exit(0 if success else 1)
@@ -1,28 +1,93 @@
 """
 PyInstaller 構建指令
 用於將 Python 專案轉換為獨立的 exe 檔案
+
+用法:
+    python build.py                 # 單一檔案 (onefile)
+    python build.py --onedir        # 啟動較快的資料夾版本 (onedir + 排除未使用模組)
+    python build.py --benchmark     # 構建後量測 dist 中各版本的啟動時間
 """
 
+import argparse
+import statistics
 import subprocess
 import sys
+import tempfile
+import time
 from pathlib import Path
 import io
 
 
-def build_exe():
-    """構建 exe 檔案"""
+EXE_SUFFIX = ".exe" if sys.platform == "win32" else ""
+
+# 各構建方式的名稱與可執行檔位置（相對於 dist）
+ONEFILE_NAME = "deadlock_translator"
+ONEDIR_NAME = "deadlock_translator_onedir"
+
+# onedir 版本排除的模組：程式未使用的標準函式庫，以及 requests / bs4 的選用依賴
+LEAN_EXCLUDES = [
+    "tkinter",
+    "unittest",
+    "pydoc",
+    "doctest",
+    "pdb",
+    "sqlite3",
+    "xmlrpc",
+    "lib2to3",
+    "test",
+    "distutils",
+    "setuptools",
+    "lxml",
+    "html5lib",
+    "chardet",
+    "cryptography",
+    "OpenSSL",
+    "socks",
+    "brotli",
+    "zstandard",
+]
+
+
+def artifact_paths() -> dict[str, Path]:
+    """各構建方式的可執行檔路徑"""
+    dist = Path.cwd() / "dist"
+    return {
+        "onefile": dist / f"{ONEFILE_NAME}{EXE_SUFFIX}",
+        "onedir": dist / ONEDIR_NAME / f"{ONEDIR_NAME}{EXE_SUFFIX}",
+    }
+
+
+def build_exe(onedir: bool = False):
+    """構建 exe 檔案
+
+    onefile 每次啟動都要先把整個執行環境解壓到暫存目錄；onedir 直接從資料夾載入，
+    並排除未使用的模組、不使用 UPX 壓縮，啟動較快。
+    """
     
     project_dir = Path.cwd()
     
     # PyInstaller 命令
-    cmd = [
-        "pyinstaller",
-        "--onefile",                          # 單一檔案輸出
-        "--console",                          # 顯示控制台窗口
-        "--name=deadlock_translator",         # 可執行檔名稱
-        "--distpath=dist",                    # 輸出目錄
-        "--specpath=.",                       # spec 檔案位置
-    ]
+    if onedir:
+        cmd = [
+            "pyinstaller",
+            "--onedir",                           # 資料夾輸出，啟動時不需解壓
+            "--console",                          # 顯示控制台窗口
+            f"--name={ONEDIR_NAME}",              # 可執行檔名稱
+            "--distpath=dist",                    # 輸出目錄
+            "--specpath=.",                       # spec 檔案位置
+            "--noupx",                            # 不壓縮，省去啟動時解壓 DLL
+            "--noconfirm",                        # 覆寫上次的輸出資料夾
+        ]
+        cmd += [f"--exclude-module={module}" for module in LEAN_EXCLUDES]
+    else:
+        cmd = [
+            "pyinstaller",
+            "--onefile",                          # 單一檔案輸出
+            "--console",                          # 顯示控制台窗口
+            f"--name={ONEFILE_NAME}",             # 可執行檔名稱
+            "--distpath=dist",                    # 輸出目錄
+            "--specpath=.",                       # spec 檔案位置
+        ]
     
     # 添加主檔案
     cmd.append("main.py")
@@ -42,8 +107,10 @@ def build_exe():
             print("=" * 50)
             print("構建成功!")
             print("=" * 50)
-            exe_path = project_dir / "dist" / "deadlock_translator.exe"
+            exe_path = artifact_paths()["onedir" if onedir else "onefile"]
             print(f"可執行檔位置: {exe_path}")
+            if onedir:
+                print("請將整個資料夾放到遊戲根目錄，並在 Steam 啟動選項使用資料夾中的 exe")
             return True
         else:
             print("構建失敗!")
@@ -58,11 +125,55 @@ def build_exe():
         return False
 
 
+def _time_launch(exe_path: Path, work_dir: Path) -> float:
+    """執行一次 exe --help 並回傳耗時（秒）"""
+    started = time.perf_counter()
+    subprocess.run([str(exe_path), "--help"], cwd=work_dir, capture_output=True, check=True)
+    return time.perf_counter() - started
+
+
+def benchmark_launch(runs: int = 10) -> bool:
+    """量測 dist 中各版本執行 --help 的冷啟動與熱啟動時間
+
+    冷啟動為構建後的第一次執行（檔案尚未在系統快取中，onefile 也尚未解壓過）；
+    熱啟動為之後多次執行的中位數。
+    """
+    artifacts = {name: path for name, path in artifact_paths().items() if path.exists()}
+    if not artifacts:
+        print("dist 中沒有可量測的可執行檔")
+        return False
+
+    print()
+    print("=" * 50)
+    print(f"啟動時間 (--help)，熱啟動取 {runs} 次中位數")
+    print("=" * 50)
+    # 在暫存目錄執行，避免在專案目錄留下日誌檔
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name, exe_path in artifacts.items():
+            try:
+                cold = _time_launch(exe_path, Path(work_dir))
+                warm = statistics.median(_time_launch(exe_path, Path(work_dir)) for _ in range(runs))
+            except (OSError, subprocess.CalledProcessError) as e:
+                print(f"  {name:<8} 執行失敗: {str(e)}")
+                return False
+            print(f"  {name:<8} 冷啟動 {cold * 1000:8.1f} ms   熱啟動 {warm * 1000:8.1f} ms   {exe_path}")
+    return True
+
+
 if __name__ == "__main__":
     try:
         sys.stdout.reconfigure(encoding="utf-8", errors="replace")
     except Exception:
         pass
 
-    success = build_exe()
+    parser = argparse.ArgumentParser(description="構建 Deadlock 翻譯更新工具 exe")
+    parser.add_argument("--onedir", action="store_true", help="構建啟動較快的資料夾版本（onedir，排除未使用模組）")
+    parser.add_argument("--benchmark", action="store_true", help="構建後量測 dist 中各版本的冷啟動與熱啟動時間")
+    parser.add_argument("--benchmark_only", action="store_true", help="不構建，只量測 dist 中已有的版本")
+    parser.add_argument("--runs", type=int, default=10, help="熱啟動量測次數")
+    args = parser.parse_args()
+
+    success = args.benchmark_only or build_exe(args.onedir)
+    if success and (args.benchmark or args.benchmark_only):
+        success = benchmark_launch(args.runs)
     sys.exit(0 if success else 1)
@@ -0,0 +1,229 @@
+"""
+Valve KeyValues 解析
+解析 gameinfo.gi 等 KeyValues 文字檔，並以原文位置就地修改個別數值，其餘內容與格式保持不變
+"""
+
+from typing import Iterator, NamedTuple
+
+# 引號字串中的跳脫字元
+ESCAPES = {'n': '\n', 't': '\t', '\\': '\\', '"': '"'}
+
+
+class KeyValuesError(ValueError):
+    """KeyValues 內容無法解析"""
+
+
+class Token(NamedTuple):
+    """一個語彙單元：kind 為 'string'、'{'、'}' 或 'condition'，start/end 為原文中的位置"""
+    kind: str
+    value: str
+    start: int
+    end: int
+    quoted: bool = False
+
+
+class Node:
+    """一個鍵值：value 為字串，或 children 為子區段的內容"""
+
+    def __init__(self, key_token: Token | None):
+        self.key_token = key_token
+        self.value_token = None
+        self.children = None
+        self.open_token = None
+        self.close_token = None
+
+    @property
+    def key(self) -> str:
+        return self.key_token.value if self.key_token else ''
+
+    @property
+    def value(self) -> str | None:
+        return self.value_token.value if self.value_token else None
+
+    @property
+    def end(self) -> int:
+        """此鍵值在原文中的結束位置"""
+        token = self.close_token or self.value_token or self.key_token
+        return token.end if token else 0
+
+    def find(self, key: str) -> 'Node | None':
+        """第一個名稱相符的子項目（不分大小寫）"""
+        key = key.lower()
+        for child in self.children or []:
+            if child.key.lower() == key:
+                return child
+        return None
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        """子項目的字串值"""
+        child = self.find(key)
+        if child is None or child.value is None:
+            return default
+        return child.value
+
+    def walk(self) -> Iterator['Node']:
+        """依原文順序列出所有子孫項目"""
+        for child in self.children or []:
+            yield child
+            yield from child.walk()
+
+
+def tokenize(text: str) -> Iterator[Token]:
+    """將 KeyValues 原文切成語彙單元，略過空白與 // 註解"""
+    length = len(text)
+    pos = 1 if text.startswith('\ufeff') else 0
+    while pos < length:
+        char = text[pos]
+        if char.isspace():
+            pos += 1
+        elif text.startswith('//', pos):
+            newline = text.find('\n', pos)
+            pos = length if newline < 0 else newline + 1
+        elif char in '{}':
+            yield Token(char, char, pos, pos + 1)
+            pos += 1
+        elif char == '"':
+            start = pos
+            pos += 1
+            value = []
+            while True:
+                if pos >= length:
+                    raise KeyValuesError(f"第 {_line_number(text, start)} 行的字串沒有結束的引號")
+                char = text[pos]
+                if char == '"':
+                    break
+                if char == '\\' and pos + 1 < length and text[pos + 1] in ESCAPES:
+                    value.append(ESCAPES[text[pos + 1]])
+                    pos += 2
+                    continue
+                value.append(char)
+                pos += 1
+            pos += 1
+            yield Token('string', ''.join(value), start, pos, quoted=True)
+        elif char == '[':
+            # 平台條件，例如 [$WIN32]
+            end = text.find(']', pos)
+            if end < 0:
+                raise KeyValuesError(f"第 {_line_number(text, pos)} 行的條件沒有結束的 ]")
+            yield Token('condition', text[pos + 1:end], pos, end + 1)
+            pos = end + 1
+        else:
+            start = pos
+            while pos < length and not text[pos].isspace() and text[pos] not in '{}"' \
+                    and not text.startswith('//', pos):
+                pos += 1
+            yield Token('string', text[start:pos], start, pos)
+
+
+def parse(text: str) -> Node:
+    """解析 KeyValues 原文，回傳包含所有最上層項目的根節點"""
+    root = Node(None)
+    root.children = []
+    stack = [root]
+    tokens = tokenize(text)
+    for token in tokens:
+        parent = stack[-1]
+        if token.kind == '}':
+            if len(stack) == 1:
+                raise KeyValuesError(f"第 {_line_number(text, token.start)} 行有多餘的 }}")
+            parent.close_token = token
+            stack.pop()
+            continue
+        if token.kind == 'condition':
+            # 條件附加在前一個項目之後，不影響結構
+            continue
+        if token.kind != 'string':
+            raise KeyValuesError(f"第 {_line_number(text, token.start)} 行缺少名稱")
+
+        node = Node(token)
+        parent.children.append(node)
+        value = next(tokens, None)
+        while value is not None and value.kind == 'condition':
+            value = next(tokens, None)
+        if value is None:
+            raise KeyValuesError(f"第 {_line_number(text, token.start)} 行的 {token.value} 缺少數值")
+        if value.kind == 'string':
+            node.value_token = value
+        elif value.kind == '{':
+            node.open_token = value
+            node.children = []
+            stack.append(node)
+        else:
+            raise KeyValuesError(f"第 {_line_number(text, value.start)} 行有多餘的 }}")
+
+    if len(stack) > 1:
+        raise KeyValuesError(f"{stack[-1].key} 區段沒有結束的 }}")
+    return root
+
+
+def find_block(root: Node, key: str) -> Node | None:
+    """依原文順序尋找第一個名稱相符的區段（不分大小寫，任意深度）"""
+    key = key.lower()
+    for node in root.walk():
+        if node.children is not None and node.key.lower() == key:
+            return node
+    return None
+
+
+def set_value(text: str, block: Node, key: str, value: str) -> str:
+    """在 block 區段中設定 key 的值，回傳修改後的原文
+
+    已有此項目時只取代數值；否則在區段最後一個項目的下一行加入，縮排、分隔與引號沿用該項目。
+    """
+    existing = block.find(key)
+    if existing is not None:
+        if existing.value_token is None:
+            raise KeyValuesError(f"{existing.key} 是區段，不能設定為字串")
+        token = existing.value_token
+        return text[:token.start] + _quote(value, token.quoted) + text[token.end:]
+
+    if block.close_token is None:
+        raise KeyValuesError(f"{block.key} 不是區段")
+    newline = '\r\n' if '\r\n' in text else '\n'
+    close = block.close_token.start
+
+    reference = next((child for child in reversed(block.children) if child.value_token), None)
+    if reference is not None:
+        key_token, value_token = reference.key_token, reference.value_token
+        separator = text[key_token.end:value_token.start]
+        if not separator or '\n' in separator:
+            separator = '\t'
+        entry = _quote(key, key_token.quoted) + separator + _quote(value, value_token.quoted)
+    else:
+        entry = f'"{key}"\t"{value}"'
+
+    last = block.children[-1] if block.children else None
+    if last is not None:
+        line_end = text.find('\n', last.end, close)
+        if line_end >= 0:
+            # 插入在最後一個項目那一行（含行尾註解）之後
+            if text[line_end - 1] == '\r':
+                line_end -= 1
+            indent = _indent(text, (reference or last).key_token.start)
+            return text[:line_end] + newline + indent + entry + text[line_end:]
+        # 整個區段寫在同一行
+        return text[:last.end] + ' ' + entry + text[last.end:]
+
+    # 空的區段
+    close_indent = _indent(text, close)
+    if text[close - len(close_indent) - 1:close - len(close_indent)] == '\n':
+        line_start = close - len(close_indent)
+        return text[:line_start] + close_indent + '\t' + entry + newline + text[line_start:]
+    return text[:close] + entry + ' ' + text[close:]
+
+
+def _quote(value: str, quoted: bool) -> str:
+    if not quoted and value and not any(c.isspace() or c in '{}"' for c in value):
+        return value
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _indent(text: str, pos: int) -> str:
+    """pos 所在行開頭的空白；該行 pos 之前有其他內容時回傳空字串"""
+    line_start = text.rfind('\n', 0, pos) + 1
+    prefix = text[line_start:pos]
+    return prefix if not prefix.strip() else ''
+
+
+def _line_number(text: str, pos: int) -> int:
+    return text.count('\n', 0, pos) + 1
@@ -0,0 +1,144 @@
+"""
+區域網路快取伺服器
+由一台電腦下載並驗證翻譯檔，再提供給同一場地的其他電腦（--serve / --source）
+"""
+
+import json
+import logging
+import re
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+# 翻譯檔與其資訊的路徑
+PACKAGE_PATH = "/package"
+METADATA_PATH = "/metadata"
+
+# 傳送檔案時的緩衝區大小
+SEND_BUFFER_SIZE = 1024 * 1024
+
+
+class LanCacheHandler(BaseHTTPRequestHandler):
+    """提供 /package（支援 ETag、Range）與 /metadata（JSON）"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'DeadlockTranslatorCache'
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.client_address[0]} {format % args}")
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def _handle(self, send_body: bool) -> None:
+        path = self.path.split('?', 1)[0]
+        info = self.server.get_package()
+        if path == METADATA_PATH:
+            if not info:
+                self._send_empty(404)
+                return
+            body = json.dumps({k: v for k, v in info.items() if k != 'path'}, ensure_ascii=False).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+            return
+
+        if path != PACKAGE_PATH:
+            self._send_empty(404)
+            return
+        if not info:
+            # 伺服器尚未完成第一次下載
+            self._send_empty(503)
+            return
+        self._send_package(info, send_body)
+
+    def _send_empty(self, status: int) -> None:
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _send_package(self, info: dict, send_body: bool) -> None:
+        size = info['size']
+        etag = f'"{info["sha256"]}"'
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        # 只支援單一範圍；If-Range 不符時回傳完整內容
+        start, end, status = 0, size - 1, 200
+        m = re.match(r'bytes=(\d*)-(\d*)$', self.headers.get('Range', '').strip())
+        if m and self.headers.get('If-Range', etag) == etag and (m.group(1) or m.group(2)):
+            if m.group(1):
+                start = int(m.group(1))
+                end = min(int(m.group(2)), size - 1) if m.group(2) else size - 1
+            else:
+                start = max(0, size - int(m.group(2)))
+            if start >= size or start > end:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            status = 206
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', formatdate(info['mtime'], usegmt=True))
+        self.send_header('Content-Disposition', f"attachment; filename*=UTF-8''{quote(info['filename'])}")
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.end_headers()
+        if not send_body:
+            return
+
+        remaining = end - start + 1
+        try:
+            with open(info['path'], 'rb') as f:
+                f.seek(start)
+                while remaining > 0:
+                    chunk = f.read(min(SEND_BUFFER_SIZE, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+        except ConnectionError:
+            # 分段下載的第一段讀到需要的範圍後就會關閉連線
+            logger.debug(f"{self.client_address[0]} 中斷連線，剩餘 {remaining} bytes 未傳送")
+            self.close_connection = True
+
+
+class LanCacheServer(ThreadingHTTPServer):
+    """區域網路快取伺服器
+
+    get_package() 回傳目前可提供的翻譯檔資訊 {path, filename, size, mtime, sha256, ...}，
+    尚未下載完成時回傳 None。每個請求都重新取得，翻譯更新後不需重新啟動伺服器。
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], get_package):
+        super().__init__(address, LanCacheHandler)
+        self.get_package = get_package
+
+    def start(self) -> threading.Thread:
+        """在背景執行緒開始接受請求"""
+        thread = threading.Thread(target=self.serve_forever, name="lan-cache", daemon=True)
+        thread.start()
+        return thread
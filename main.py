@@ -3,12 +3,24 @@
 Deadlock 繁體中文翻譯自動更新工具
 """
 
+import time
+
+# 程式啟動的時間點，用於量測快速啟動路徑的耗時
+PROCESS_STARTED = time.perf_counter()
+
 import logging
 from logging.handlers import RotatingFileHandler
 import sys
 import os
-from translator import TranslationManager
+import random
+import threading
 import argparse
+import atexit
+
+# 記錄載入 translator 所花的時間，供 --profile 區分載入與實際工作
+_import_started = time.perf_counter()
+from translator import TranslationManager
+TRANSLATOR_IMPORT_SECONDS = time.perf_counter() - _import_started
 
 # 設定日誌
 logging.basicConfig(
@@ -21,17 +33,208 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# 預先下載失敗後的第一次重試間隔（秒），之後每次加倍
+PREFETCH_RETRY_DELAY = 60
+
+# 快速啟動路徑（不連網）從程式啟動到決定啟動遊戲的目標時間（秒）
+FAST_PATH_TARGET = 0.2
+
+
+def run_update(manager: TranslationManager, staged_max_age: float = 0) -> str | None:
+    """下載並替換翻譯檔案，失敗時回傳錯誤訊息"""
+    with manager.timings.span('update'):
+        # 等待預先下載程序完成目前的工作
+        if not manager.download_lock.acquire(timeout=manager.download_timeout):
+            logger.warning("另一個程序正在更新翻譯檔案，本次略過更新")
+            return None
+        try:
+            return _run_update_locked(manager, staged_max_age)
+        finally:
+            manager.download_lock.release()
+
+
+def _run_update_locked(manager: TranslationManager, staged_max_age: float) -> str | None:
+    """run_update 取得鎖之後的實際步驟"""
+    # 優先使用預先下載並驗證過的翻譯檔，不需連網
+    download_path = manager.staged_package(staged_max_age) if staged_max_age > 0 else None
+    if download_path:
+        logger.info(f"使用預先下載的翻譯檔案: {download_path}")
+    elif manager.delta_enabled and _timed(manager, 'delta', manager.delta_update):
+        logger.info("增量更新成功!")
+        return None
+    elif manager.delta_enabled and manager.install_cancelled():
+        # 增量更新因遊戲已啟動而取消，完整下載後也無法安裝
+        logger.info("遊戲已啟動，翻譯檔案將於下次啟動時安裝")
+        return None
+    else:
+        # 下載翻譯檔案
+        logger.info("開始下載翻譯檔案...")
+        download_path = _timed(manager, 'download', manager.download_translation)
+        if not download_path:
+            return "下載翻譯檔案失敗"
+        
+        logger.info(f"下載成功: {download_path}")
+    
+    # 替換檔案（伺服器回應未變更、已安裝過同一版本且已安裝的檔案未被改動時略過）
+    if manager.package_not_modified and manager.is_package_installed(download_path):
+        logger.info("翻譯檔案未變更，略過替換")
+        return None
+
+    logger.info("替換遊戲檔案...")
+    if not _timed(manager, 'install', manager.replace_translation_files, download_path):
+        if manager.install_cancelled():
+            logger.info("遊戲已啟動，翻譯檔案將於下次啟動時安裝")
+            return None
+        return "替換檔案失敗"
+    
+    logger.info("檔案替換成功!")
+    return None
+
+
+def _timed(manager: TranslationManager, name: str, func, *args):
+    """在計時區段 name 中執行 func(*args)"""
+    with manager.timings.span(name):
+        return func(*args)
+
+
+def write_timings(manager: TranslationManager, path: str) -> None:
+    """將各步驟的耗時寫入 JSON 檔案"""
+    try:
+        manager.timings.write_json(path)
+        logger.info(f"已寫入各步驟耗時: {path}")
+    except Exception as e:
+        logger.warning(f"寫入耗時記錄失敗: {str(e)}")
+
+
+def run_verify_installed(manager: TranslationManager) -> str | None:
+    """離線檢查並修復已安裝的翻譯檔案，不下載新版本"""
+    if not manager.download_lock.acquire(timeout=manager.download_timeout):
+        logger.warning("另一個程序正在更新翻譯檔案，本次略過檢查")
+        return None
+    try:
+        logger.info("檢查已安裝的翻譯檔案...")
+        if not _timed(manager, 'verify_installed', manager.verify_installed):
+            return "已安裝的翻譯檔案無法修復，請不加 --verify_installed 重新執行以下載翻譯"
+        return None
+    finally:
+        manager.download_lock.release()
+
+
+def run_prefetch(manager: TranslationManager, interval: float):
+    """預先下載模式：定期檢查並下載新版翻譯，失敗時以指數退避重試"""
+    logger.info(f"預先下載模式，每 {interval:.0f} 秒檢查一次（按 Ctrl+C 結束）")
+    failures = 0
+    while True:
+        if manager.prefetch_translation():
+            failures = 0
+            delay = interval
+        else:
+            failures += 1
+            delay = min(interval, PREFETCH_RETRY_DELAY * 2 ** (failures - 1))
+
+        # 加入隨機抖動，避免多台電腦同時請求
+        delay *= random.uniform(0.9, 1.1)
+        logger.info(f"下次檢查: {delay:.0f} 秒後")
+        time.sleep(delay)
+
+
+def run_serve(manager: TranslationManager, host: str, port: int, interval: float):
+    """區域網路快取模式：定期下載並驗證翻譯，同時以 HTTP 提供給其他電腦（--source）"""
+    from lan_cache import LanCacheServer, PACKAGE_PATH
+
+    server = LanCacheServer((host, port), manager.served_package)
+    server.start()
+    logger.info(f"區域網路快取伺服器已啟動: http://{host}:{port}{PACKAGE_PATH}")
+    try:
+        run_prefetch(manager, interval)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def run_update_with_budget(manager: TranslationManager, max_delay: float, staged_max_age: float = 0) -> str | None:
+    """在背景執行緒更新翻譯，最多等待 max_delay 秒
+
+    超過時間上限時取消安裝步驟並直接回傳，讓遊戲以目前已安裝的翻譯啟動（正在換入遊戲目錄時
+    先等待換入完成）；下載仍在背景繼續，完成的檔案會在下次啟動時安裝。
+    """
+    result = {}
+
+    def worker():
+        try:
+            result['error'] = run_update(manager, staged_max_age)
+        except Exception as e:
+            logger.exception(f"背景更新發生錯誤: {str(e)}")
+            result['error'] = f"更新翻譯失敗: {str(e)}"
+
+    updater = threading.Thread(target=worker, name="updater")
+    updater.start()
+    updater.join(max_delay)
+
+    if updater.is_alive():
+        logger.warning(f"更新超過 {max_delay} 秒的啟動延遲上限，使用目前已安裝的翻譯")
+        manager.cancel_install()
+        return None
+
+    return result.get('error')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """建立命令列參數"""
+    parser = argparse.ArgumentParser()
+    # parser.add_argument("--forum_url", default="https://forum.gamer.com.tw/C.php?bsn=80911&snA=76")
+    # parser.add_argument("--download_timeout", type=int, default=30)
+    # parser.add_argument("--translation_filename", default="taiwan_translation.zip")
+    parser.add_argument("--no_auto_launch", action="store_false", dest="auto_launch", help="阻止遊戲啟動")
+    parser.add_argument("--log_level", default="INFO")
+    parser.add_argument("--max_startup_delay", type=float, default=0, help="更新翻譯最多延遲遊戲啟動的秒數，超過則直接啟動（預設 0 為不限制）")
+    parser.add_argument("--verify_installed", "--verify-installed", action="store_true", help="只離線檢查並修復已安裝的翻譯檔案（不連網下載）")
+    parser.add_argument("--rollback", action="store_true", help="還原到上一次安裝前的翻譯檔案")
+    parser.add_argument("--prefetch", action="store_true", help="預先下載模式：定期在背景下載並驗證新版翻譯，啟動時直接安裝")
+    parser.add_argument("--prefetch_interval", type=float, default=30 * 60, help="預先下載的檢查間隔秒數（預設 30 分鐘）")
+    parser.add_argument("--serve", action="store_true", help="區域網路快取模式：定期下載翻譯並提供給其他電腦，不安裝也不啟動遊戲")
+    parser.add_argument("--serve_host", default="0.0.0.0", help="--serve 監聽的位址（預設 0.0.0.0）")
+    parser.add_argument("--serve_port", type=int, default=8787, help="--serve 監聽的連接埠（預設 8787）")
+    parser.add_argument("--source", default=None, help="從區域網路快取伺服器下載翻譯，例如 http://192.168.1.10:8787")
+    parser.add_argument("--mirror", action="append", default=None, help="額外的下載來源，可重複指定：drive:<檔案 ID>、HTTP 網址或本機資料夾；與論壇同時探測，使用最先回應者")
+    parser.add_argument("--refresh", action="store_true", help="忽略快取，重新解析論壇頁面")
+    parser.add_argument("--forum_cache_ttl", type=int, default=6 * 60 * 60, help="論壇下載連結快取的有效秒數（預設 6 小時）")
+    parser.add_argument("--delta", action="store_true", help="增量更新：只下載遠端 zip 中有變更的檔案（伺服器需支援 Range）")
+    parser.add_argument("--verify", choices=["fast", "full"], default="fast", help="下載檔案的驗證方式：fast 只檢查未驗證或有變動的檔案，full 每次完整檢查")
+    parser.add_argument("--cache_stats", "--cache-stats", action="store_true", help="列出下載目錄中快取的翻譯檔與大小")
+    parser.add_argument("--cache_max_bytes", type=int, default=1024 * 1024 * 1024, help="下載目錄快取的大小上限（預設 1 GiB，0 為不限制）")
+    parser.add_argument("--cache_max_versions", type=int, default=3, help="下載目錄保留的翻譯檔版本數（預設 3，0 為不限制）")
+    parser.add_argument("--download_connections", type=int, default=1, help="分段下載使用的連線數（預設 1，不分段）")
+    parser.add_argument("--timings", choices=["json"], default=None, help="輸出各步驟的耗時、傳輸量與寫入量（json）")
+    parser.add_argument("--timings_file", default="deadlock_translator_timings.json", help="--timings 的輸出檔案（預設 deadlock_translator_timings.json）")
+    parser.add_argument("--install_workers", type=int, default=None, help="解壓寫入檔案的執行緒數（預設為 CPU 核心數）")
+    parser.add_argument("--profile", action="store_true", help="以 cProfile 執行並列出最耗時的函式（背景執行緒中的工作不會被記錄）")
+    parser.add_argument("--profile_file", default="deadlock_translator.pstats", help="--profile 的 pstats 輸出檔案")
+    return parser
+
+
+def run_profiled(path: str, top: int = 25) -> bool:
+    """以 cProfile 執行 main()，寫入 pstats 檔案並列出累計耗時最多的函式"""
+    import cProfile
+    import io
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(main)
+    finally:
+        profiler.dump_stats(path)
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(top)
+        logger.info(f"載入 translator 耗時 {TRANSLATOR_IMPORT_SECONDS:.3f} 秒")
+        logger.info(f"效能分析結果已寫入: {path}\n{stream.getvalue()}")
+
+
 def main():
     """主函式：執行步驟並回傳 success（True/False）。
     同時在成功時提示是否啟動遊戲；失敗時等待 Enter 關閉。"""
     try:
-        parser = argparse.ArgumentParser()
-        # parser.add_argument("--forum_url", default="https://forum.gamer.com.tw/C.php?bsn=80911&snA=76")
-        # parser.add_argument("--download_timeout", type=int, default=30)
-        # parser.add_argument("--translation_filename", default="taiwan_translation.zip")
-        parser.add_argument("--no_auto_launch", action="store_false", dest="auto_launch", help="阻止遊戲啟動")
-        parser.add_argument("--log_level", default="INFO")
-        args, _ = parser.parse_known_args()
+        args, _ = build_parser().parse_known_args()
 
         logging.getLogger().setLevel(getattr(logging, args.log_level))
         logger.info("=" * 50)
@@ -40,33 +243,73 @@ def main():
         
         # 初始化翻譯管理器
         manager = TranslationManager(args)
+
+        # 結束時輸出各步驟耗時（背景更新執行緒結束後才寫入）
+        if args.timings == "json":
+            atexit.register(write_timings, manager, args.timings_file)
         
         # logger.info(f"遊戲路徑: {manager.deadlock_path}")
         logger.info(f"論壇網址: {manager.forum_url}")
         
-        # 下載翻譯檔案
-        logger.info("開始下載翻譯檔案...")
-        download_path = manager.download_translation()
-        if not download_path:
-            logger.error("下載翻譯檔案失敗")
-            input("按 Enter 鍵關閉...")
-            return False
-        
-        logger.info(f"下載成功: {download_path}")
-        
-        # 替換檔案
-        logger.info("替換遊戲檔案...")
-        if not manager.replace_translation_files(download_path):
-            logger.error("替換檔案失敗")
+        # 還原到上一個版本的翻譯檔案，不更新也不啟動遊戲
+        if args.rollback:
+            if not manager.download_lock.acquire(timeout=manager.download_timeout):
+                logger.error("另一個程序正在更新翻譯檔案，請稍後再試")
+                return False
+            try:
+                return manager.rollback_translation()
+            finally:
+                manager.download_lock.release()
+
+        # 只列出下載快取，不更新也不啟動遊戲
+        if args.cache_stats:
+            return manager.cache_stats()
+
+        # 區域網路快取模式：下載並提供給其他電腦，不安裝也不啟動遊戲
+        if args.serve:
+            try:
+                run_serve(manager, args.serve_host, args.serve_port, args.prefetch_interval)
+            except KeyboardInterrupt:
+                logger.info("結束區域網路快取模式")
+            return True
+
+        # 預先下載模式：只下載與驗證，不安裝也不啟動遊戲
+        if args.prefetch:
+            try:
+                run_prefetch(manager, args.prefetch_interval)
+            except KeyboardInterrupt:
+                logger.info("結束預先下載模式")
+            return True
+
+        # 預先下載程序會定期更新記錄，超過兩個週期未更新就不再採用
+        staged_max_age = args.prefetch_interval * 2
+
+        # 本機狀態已是最新時不連網（也不載入 HTTP 模組），直接啟動遊戲
+        up_to_date = not args.verify_installed and _timed(manager, 'fast_path', manager.is_up_to_date)
+
+        # 下載並替換翻譯檔案（設定啟動延遲上限時於背景執行緒進行）
+        if up_to_date:
+            elapsed = time.perf_counter() - PROCESS_STARTED
+            logger.info(f"翻譯已是最新版本，略過更新（啟動檢查耗時 {elapsed:.3f} 秒）")
+            if elapsed > FAST_PATH_TARGET:
+                logger.warning(f"快速啟動檢查超過目標 {FAST_PATH_TARGET} 秒")
+            error = None
+        elif args.verify_installed:
+            error = run_verify_installed(manager)
+        elif args.max_startup_delay > 0:
+            error = run_update_with_budget(manager, args.max_startup_delay, staged_max_age)
+        else:
+            error = run_update(manager, staged_max_age)
+        if error:
+            logger.error(error)
             input("按 Enter 鍵關閉...")
             return False
         
-        logger.info("檔案替換成功!")
-        
         # 修改 gameinfo.gi 以啟用繁體中文
-        logger.info("更新遊戲設定...")
-        if not manager.update_gameinfo_language():
-            logger.warning("更新遊戲設定失敗，但繼續執行")
+        if not up_to_date:
+            logger.info("更新遊戲設定...")
+            if not _timed(manager, 'gameinfo', manager.update_gameinfo_language):
+                logger.warning("更新遊戲設定失敗，但繼續執行")
 
         logger.info("完成！")
         logger.info("=" * 50)
@@ -84,7 +327,7 @@ def main():
         # 啟動遊戲
         if manager.auto_launch:
             logger.info("啟動 Deadlock 遊戲...")
-            if manager.launch_game():
+            if _timed(manager, 'launch', manager.launch_game):
                 logger.info("遊戲已啟動")
             else:
                 logger.warning("無法自動啟動遊戲，請手動啟動")
@@ -98,5 +341,6 @@ def main():
 
 
 if __name__ == "__main__":
-    success = main()
+    cli_args, _ = build_parser().parse_known_args()
+    success = run_profiled(cli_args.profile_file) if cli_args.profile else main()
     sys.exit(0 if success else 1)
@@ -0,0 +1,184 @@
+"""
+遠端 zip 讀取
+透過 HTTP Range 請求讀取遠端 zip 的中央目錄與個別成員，不需下載整個檔案
+"""
+
+import bisect
+import logging
+import re
+import struct
+import threading
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+# zip 結尾記錄 (End of Central Directory) 的最大長度：22 bytes 加上最長 65535 bytes 的註解
+EOCD_MAX_SIZE = 22 + 65535
+
+# 讀取成員資料時單次請求的最大大小
+READAHEAD_SIZE = 4 * 1024 * 1024
+
+
+class RemoteZipError(Exception):
+    """伺服器不支援 Range 請求或遠端 zip 結構無法解析"""
+
+
+class RemoteZipSource:
+    """遠端 zip 檔案
+
+    建立時以兩個 Range 請求取得檔案結尾與中央目錄並快取，之後每個成員只下載
+    它自己的本地標頭與壓縮資料。可供多個執行緒同時以 open_zip() 開啟。
+    """
+
+    def __init__(self, session, url: str, timeout: float):
+        self.session = session
+        self.url = url
+        self.timeout = timeout
+        self.size = 0
+        self.headers = {}
+        self.bytes_fetched = 0
+        self.requests = 0
+        self._stats_lock = threading.Lock()
+        # 已快取的範圍 [(起點, 資料)]，只包含檔案結尾與中央目錄
+        self._cache = []
+        # 各成員本地標頭的起點與中央目錄起點，用來限制預讀範圍
+        self._boundaries = []
+        self._load_directory()
+
+    def _get_range(self, range_value: str):
+        """送出 Range 請求，伺服器未回應 206 時拋出 RemoteZipError"""
+        response = self.session.get(self.url, headers={'Range': range_value}, timeout=self.timeout)
+        if response.status_code != 206:
+            response.close()
+            raise RemoteZipError(f"伺服器不支援 Range 請求 (HTTP {response.status_code})")
+        with self._stats_lock:
+            self.requests += 1
+            self.bytes_fetched += len(response.content)
+        return response
+
+    def fetch(self, start: int, end: int) -> bytes:
+        """下載位元組範圍 [start, end)"""
+        if end <= start:
+            return b''
+        data = self._get_range(f'bytes={start}-{end - 1}').content
+        if len(data) != end - start:
+            raise RemoteZipError(f"Range 回應長度不符: 預期 {end - start}，實際 {len(data)}")
+        return data
+
+    def cached(self, start: int, end: int) -> bytes | None:
+        """若範圍 [start, end) 已在快取中則回傳資料"""
+        for cache_start, data in self._cache:
+            if cache_start <= start and end <= cache_start + len(data):
+                return data[start - cache_start:end - cache_start]
+        return None
+
+    def next_boundary(self, position: int) -> int:
+        """position 之後的下一個成員起點或中央目錄起點"""
+        index = bisect.bisect_right(self._boundaries, position)
+        if index < len(self._boundaries):
+            return self._boundaries[index]
+        return self.size
+
+    def _load_directory(self) -> None:
+        """讀取遠端 zip 結尾記錄與中央目錄並快取"""
+        response = self._get_range(f'bytes=-{EOCD_MAX_SIZE}')
+        m = re.search(r'/(\d+)\s*$', response.headers.get('content-range', ''))
+        if not m:
+            raise RemoteZipError("Range 回應缺少檔案總大小")
+        self.size = int(m.group(1))
+        self.headers = response.headers
+        # 之後的請求直接使用轉址後的網址
+        self.url = response.url
+
+        tail = response.content
+        tail_start = self.size - len(tail)
+        self._cache.append((tail_start, tail))
+
+        eocd = tail.rfind(b'PK\x05\x06')
+        if eocd < 0 or len(tail) - eocd < 22:
+            raise RemoteZipError("找不到 zip 結尾記錄")
+        cd_size, cd_offset = struct.unpack('<II', tail[eocd + 12:eocd + 20])
+
+        # ZIP64：實際的中央目錄位置記錄在 ZIP64 結尾記錄中
+        if cd_size == 0xFFFFFFFF or cd_offset == 0xFFFFFFFF:
+            locator = eocd - 20
+            if locator < 0 or tail[locator:locator + 4] != b'PK\x06\x07':
+                raise RemoteZipError("找不到 ZIP64 結尾記錄")
+            (zip64_offset,) = struct.unpack('<Q', tail[locator + 8:locator + 16])
+            record = self.cached(zip64_offset, zip64_offset + 56) or self.fetch(zip64_offset, zip64_offset + 56)
+            cd_size, cd_offset = struct.unpack('<QQ', record[40:56])
+
+        if self.cached(cd_offset, cd_offset + cd_size) is None:
+            self._cache.append((cd_offset, self.fetch(cd_offset, cd_offset + cd_size)))
+
+        # 取得各成員的起點，作為之後預讀的邊界
+        with self.open_zip() as zip_file:
+            offsets = {info.header_offset for info in zip_file.infolist()}
+        self._boundaries = sorted(offsets | {cd_offset})
+
+    def open_zip(self) -> zipfile.ZipFile:
+        """開啟一個讀取遠端內容的 ZipFile（每個執行緒應各自開啟）"""
+        return zipfile.ZipFile(RemoteZipFile(self), 'r')
+
+
+class RemoteZipFile:
+    """提供 zipfile 使用的唯讀檔案物件，讀取時才以 Range 請求下載所需範圍"""
+
+    def __init__(self, source: RemoteZipSource):
+        self._source = source
+        self._pos = 0
+        self._buffer_start = 0
+        self._buffer = b''
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += self._source.size
+        self._pos = max(0, offset)
+        return self._pos
+
+    def read(self, n: int = -1) -> bytes:
+        size = self._source.size
+        if n is None or n < 0:
+            n = size - self._pos
+        end = min(size, self._pos + n)
+        if end <= self._pos:
+            return b''
+
+        data = self._read_range(self._pos, end)
+        self._pos = end
+        return data
+
+    def _read_range(self, start: int, end: int) -> bytes:
+        # 預讀緩衝區
+        buffer_end = self._buffer_start + len(self._buffer)
+        if self._buffer_start <= start and end <= buffer_end:
+            return self._buffer[start - self._buffer_start:end - self._buffer_start]
+
+        # 檔案結尾與中央目錄
+        data = self._source.cached(start, end)
+        if data is not None:
+            return data
+
+        # 開頭已在緩衝區中的部分不重複下載
+        prefix = b''
+        if self._buffer_start <= start < buffer_end:
+            prefix = self._buffer[start - self._buffer_start:]
+            start = buffer_end
+
+        # 預讀到下一個成員起點為止，避免多下載不需要的成員
+        fetch_end = min(self._source.size, start + max(end - start, READAHEAD_SIZE))
+        fetch_end = min(fetch_end, max(self._source.next_boundary(start), end))
+        self._buffer = self._source.fetch(start, fetch_end)
+        self._buffer_start = start
+        return prefix + self._buffer[:end - start]
+
+    def close(self) -> None:
+        self._buffer = b''
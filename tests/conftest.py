@@ -0,0 +1,11 @@
+"""
+pytest 設定：將專案根目錄加入 sys.path，讓直接執行 pytest 時也能匯入 translator 等模組
+（python -m pytest 與 python -m unittest discover -s tests 會自動加入目前目錄）
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,101 @@
+"""
+測試共用工具
+建立指向暫存遊戲目錄的 TranslationManager，並以 lan_cache.LanCacheServer 在本機提供翻譯檔
+"""
+
+import argparse
+import hashlib
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from lan_cache import LanCacheHandler, LanCacheServer
+from translator import TranslationManager
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# 與 main.py 命令列參數的預設值相同
+DEFAULT_ARGS = {
+    'auto_launch': False,
+    'install_workers': None,
+    'download_connections': 1,
+    'forum_cache_ttl': 6 * 60 * 60,
+    'refresh': False,
+    'verify': 'fast',
+    'delta': False,
+    'source': None,
+    'mirror': None,
+    'cache_max_bytes': 1024 * 1024 * 1024,
+    'cache_max_versions': 3,
+}
+
+
+def make_manager(game_dir: Path, **options) -> TranslationManager:
+    """建立以 game_dir 為遊戲目錄的 TranslationManager，options 覆寫命令列參數"""
+    args = argparse.Namespace(**{**DEFAULT_ARGS, **options})
+    with mock.patch.object(TranslationManager, '_detect_deadlock_path', return_value=game_dir):
+        return TranslationManager(args)
+
+
+def write_zip(path: Path, members: dict[str, bytes], compression: int = zipfile.ZIP_DEFLATED) -> Path:
+    """寫入包含 members（{路徑: 內容}）的 zip 檔案"""
+    with zipfile.ZipFile(path, 'w', compression) as zip_file:
+        for name, data in members.items():
+            zip_file.writestr(name, data)
+    return path
+
+
+class RecordingHandler(LanCacheHandler):
+    """記錄每個請求的方法、路徑與 Range 標頭"""
+
+    def _handle(self, send_body: bool) -> None:
+        self.server.requests.append((self.command, self.path, self.headers.get('Range')))
+        super()._handle(send_body)
+
+
+class NoRangeHandler(RecordingHandler):
+    """不支援 Range 的伺服器：忽略 Range 標頭，也不回傳 Accept-Ranges"""
+
+    def _send_package(self, info: dict, send_body: bool) -> None:
+        del self.headers['Range']
+        super()._send_package(info, send_body)
+
+    def send_header(self, keyword, value):
+        if keyword.lower() != 'accept-ranges':
+            super().send_header(keyword, value)
+
+
+class PackageServer:
+    """在本機提供一個翻譯檔的 HTTP 伺服器，以 with 區塊啟動與關閉
+
+    serve() 可隨時更換提供的檔案；requests 記錄收到的 (方法, 路徑, Range)。
+    """
+
+    def __init__(self, ranges: bool = True):
+        self.package = None
+        self.server = LanCacheServer(('127.0.0.1', 0), lambda: self.package)
+        self.server.RequestHandlerClass = RecordingHandler if ranges else NoRangeHandler
+        self.server.requests = []
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    @property
+    def requests(self) -> list:
+        return self.server.requests
+
+    def serve(self, path: Path, filename: str | None = None) -> None:
+        data = path.read_bytes()
+        self.package = {
+            'path': str(path),
+            'filename': filename or path.name,
+            'size': len(data),
+            'mtime': path.stat().st_mtime,
+            'sha256': hashlib.sha256(data).hexdigest(),
+        }
+
+    def __enter__(self) -> 'PackageServer':
+        self.server.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,130 @@
+"""
+增量更新（--delta）測試
+以本機 HTTP 伺服器提供 v1/v2 兩個版本的 zip，確認只下載有變更的成員，且安裝結果與 v2 相同
+"""
+
+import os
+import re
+import struct
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from remote_zip import EOCD_MAX_SIZE
+from support import PackageServer, make_manager, write_zip
+
+UNCHANGED = "game/citadel/resource/unchanged.bin"
+CHANGED = "game/citadel/resource/changed.bin"
+TEXT = "game/citadel/resource/localization/citadel_gc_tchinese.txt"
+
+
+def member_data_ranges(path: Path) -> dict[str, tuple[int, int]]:
+    """zip 中每個成員從本地標頭到壓縮資料結尾的位元組範圍 [start, end)"""
+    ranges = {}
+    with open(path, 'rb') as f, zipfile.ZipFile(path) as zip_file:
+        for info in zip_file.infolist():
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack('<HH', f.read(4))
+            end = info.header_offset + 30 + name_length + extra_length + info.compress_size
+            ranges[info.filename] = (info.header_offset, end)
+    return ranges
+
+
+def requested_ranges(requests: list, size: int) -> list[tuple[int, int]]:
+    """將伺服器記錄的 Range 標頭換算為位元組範圍 [start, end)"""
+    ranges = []
+    for method, _, header in requests:
+        m = re.match(r'bytes=(\d*)-(\d*)$', header or '')
+        if method != 'GET' or not m:
+            continue
+        if m.group(1):
+            end = int(m.group(2)) + 1 if m.group(2) else size
+            ranges.append((int(m.group(1)), min(end, size)))
+        else:
+            ranges.append((max(0, size - int(m.group(2))), size))
+    return ranges
+
+
+class DeltaUpdateTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.game_dir = self.root / "game_root"
+        self.game_dir.mkdir()
+
+        unchanged = os.urandom(1024 * 1024)
+        # 未變更的成員放在最前面，讀取 zip 結尾記錄的請求（最後 64 KB）不會涵蓋它
+        self.v1 = {
+            UNCHANGED: unchanged,
+            CHANGED: os.urandom(256 * 1024),
+            TEXT: "\"lang\" { \"Tokens\" { \"hello\" \"你好 v1\" } }".encode('utf-8'),
+            "game/citadel/resource/removed.txt": b"only in v1",
+        }
+        self.v2 = {
+            UNCHANGED: unchanged,
+            CHANGED: os.urandom(256 * 1024),
+            TEXT: "\"lang\" { \"Tokens\" { \"hello\" \"你好 v2\" } }".encode('utf-8'),
+            "game/citadel/resource/added.txt": b"only in v2",
+        }
+        # 不壓縮，讓未變更成員的資料在兩個版本中完全相同
+        self.v1_path = write_zip(self.root / "v1.zip", self.v1, zipfile.ZIP_STORED)
+        self.v2_path = write_zip(self.root / "v2.zip", self.v2, zipfile.ZIP_STORED)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_fetches_only_changed_members(self):
+        self.assertTrue(make_manager(self.game_dir).replace_translation_files(self.v1_path))
+
+        with PackageServer() as server:
+            server.serve(self.v2_path, "taiwan_translation.zip")
+            manager = make_manager(self.game_dir, source=server.url, delta=True)
+            self.assertTrue(manager.delta_update())
+
+        size = self.v2_path.stat().st_size
+        fetched = requested_ranges(server.requests, size)
+        self.assertTrue(fetched)
+        self.assertNotIn((0, size), fetched)
+
+        members = member_data_ranges(self.v2_path)
+        unchanged_start, unchanged_end = members[UNCHANGED]
+        for start, end in fetched:
+            self.assertFalse(start < unchanged_end and unchanged_start < end,
+                             f"下載了未變更成員的範圍 {start}-{end}")
+        for name in (CHANGED, TEXT, "game/citadel/resource/added.txt"):
+            member_start, member_end = members[name]
+            self.assertTrue(any(start <= member_start and member_end <= end for start, end in fetched),
+                            f"沒有下載有變更的成員 {name}")
+        # 除了固定長度的結尾記錄請求之外，下載量不超過有變更的部分
+        self.assertLessEqual(sum(end - start for start, end in fetched),
+                             size - (unchanged_end - unchanged_start) + EOCD_MAX_SIZE)
+
+        # 安裝結果與 v2 相同，v1 才有的檔案已移除
+        for name, data in self.v2.items():
+            self.assertEqual((self.game_dir / name).read_bytes(), data, name)
+        self.assertFalse((self.game_dir / "game/citadel/resource/removed.txt").exists())
+
+        manifest = manager._load_install_manifest()
+        self.assertEqual(manifest['source'], "taiwan_translation.zip")
+        self.assertEqual(set(manifest['files']), set(self.v2))
+
+        # 記錄遠端驗證資訊，之後不需完整下載即可判斷是否為最新版本
+        validators = manager._load_download_validators()[f"{server.url}/package"]
+        self.assertTrue(validators['delta'])
+        self.assertEqual(validators['filename'], "taiwan_translation.zip")
+
+    def test_falls_back_without_range_support(self):
+        self.assertTrue(make_manager(self.game_dir).replace_translation_files(self.v1_path))
+
+        with PackageServer(ranges=False) as server:
+            server.serve(self.v2_path, "taiwan_translation.zip")
+            manager = make_manager(self.game_dir, source=server.url, delta=True)
+            self.assertFalse(manager.delta_update())
+
+        for name, data in self.v1.items():
+            self.assertEqual((self.game_dir / name).read_bytes(), data, name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+Google Drive 下載確認頁面測試
+以本機伺服器重播確認頁面，確認會跟隨確認連結取得翻譯檔，配額頁面則不寫入任何檔案
+
+fixtures/drive 中的頁面是依 Google Drive 確認頁面的結構手寫的合成頁面，不是實際擷取的回應：
+檔案 ID（BIG、OLD 等）、uuid 與確認參數都是虛構的，版面也只保留解析會用到的部分。
+"""
+
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qsl, urlparse
+
+from support import FIXTURES_DIR, make_manager, write_zip
+from translator import find_drive_confirm_url
+
+DRIVE_FIXTURES = FIXTURES_DIR / "drive"
+# 新版確認頁面的表單送往這個網域，重播時改為本機伺服器
+USERCONTENT_URL = "https://drive.usercontent.google.com"
+
+
+class FakeDriveHandler(BaseHTTPRequestHandler):
+    """依檔案 ID 回傳對應的確認頁面，帶正確的確認參數時回傳翻譯檔"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = dict(parse_qsl(url.query))
+        file_id, confirm = query.get('id'), query.get('confirm')
+        self.server.requests.append(self.path)
+
+        if url.path == '/download' and file_id == 'BIG' and confirm == 't' and query.get('uuid'):
+            return self._send_package()
+        if url.path != '/uc':
+            return self._send(404, b'', 'text/plain')
+        if file_id == 'BIG':
+            return self._send_fixture("virus_scan_form.html")
+        if file_id == 'OLD':
+            if confirm == 'Xq9v':
+                return self._send_package()
+            return self._send_fixture("virus_scan_confirm_link.html")
+        if file_id == 'COOKIE':
+            if confirm == 'C00k':
+                return self._send_package()
+            return self._send_fixture(
+                "download_warning_cookie.html",
+                [('Set-Cookie', 'download_warning_13058876669334088843_COOKIE=C00k; Path=/')],
+            )
+        if file_id == 'QUOTA':
+            return self._send_fixture("quota_exceeded.html")
+        self._send(404, b'', 'text/plain')
+
+    def _send_fixture(self, name: str, headers=()):
+        page = (DRIVE_FIXTURES / name).read_text(encoding='utf-8')
+        page = page.replace(USERCONTENT_URL, self.server.url)
+        self._send(200, page.encode('utf-8'), 'text/html; charset=utf-8', headers)
+
+    def _send_package(self):
+        self._send(200, self.server.package, 'application/zip',
+                   [('Content-Disposition', 'attachment; filename="taiwan_translation.zip"')])
+
+    def _send(self, status: int, body: bytes, content_type: str, headers=()):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class DriveConfirmTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        package = write_zip(Path(cls._tmp.name) / "package.zip", {
+            "game/citadel/resource/localization/citadel_gc_tchinese.txt": "翻譯".encode('utf-8') * 4096,
+        })
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeDriveHandler)
+        cls.server.daemon_threads = True
+        cls.server.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.server.package = package.read_bytes()
+        cls.server.requests = []
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls._tmp.cleanup()
+
+    def setUp(self):
+        self._game = tempfile.TemporaryDirectory()
+        self.game_dir = Path(self._game.name)
+        self.server.requests.clear()
+
+    def tearDown(self):
+        self._game.cleanup()
+
+    def download(self, file_id: str) -> Path | None:
+        manager = make_manager(self.game_dir)
+        # 以固定的下載網址取代論壇解析（解析時才會建立下載目錄）
+        manager.download_dir.mkdir()
+        url = f"{self.server.url}/uc?export=download&id={file_id}"
+        with mock.patch.object(manager, '_resolve_download_url', return_value=url):
+            return manager.download_translation()
+
+    def assert_package(self, path: Path | None):
+        self.assertIsNotNone(path)
+        self.assertEqual(path.name, "taiwan_translation.zip")
+        self.assertEqual(path.read_bytes(), self.server.package)
+
+    def test_follows_download_form(self):
+        self.assert_package(self.download('BIG'))
+        self.assertTrue(any(request.startswith('/download?') for request in self.server.requests))
+
+    def test_follows_legacy_confirm_link(self):
+        self.assert_package(self.download('OLD'))
+        self.assertIn('confirm=Xq9v', self.server.requests[-1])
+
+    def test_follows_download_warning_cookie(self):
+        self.assert_package(self.download('COOKIE'))
+        self.assertIn('confirm=C00k', self.server.requests[-1])
+
+    def test_quota_page_writes_no_file(self):
+        self.assertIsNone(self.download('QUOTA'))
+        self.assertEqual(len(self.server.requests), 1)
+        download_dir = self.game_dir / "downloads"
+        written = [path.name for path in download_dir.iterdir() if path.suffix in ('.zip', '.part')]
+        self.assertEqual(written, [])
+
+
+class FindConfirmUrlTest(unittest.TestCase):
+    def test_form_attributes_in_any_order(self):
+        page = (
+            "<form method=get action='https://drive.usercontent.google.com/download?authuser=0' id=\"download-form\">"
+            '<input value="Download anyway" type="submit" id="uc-download-link">'
+            '<input value="BIG" name="id" type="hidden">'
+            "<input name='export' type=HIDDEN value='download'/>"
+            '<input type="hidden" value="t" name="confirm">'
+            '<input name="uuid" value="a&amp;b" type="hidden"></form>'
+        )
+        self.assertEqual(
+            find_drive_confirm_url(page, "https://drive.google.com/uc?export=download&id=BIG"),
+            "https://drive.usercontent.google.com/download?id=BIG&export=download&confirm=t&uuid=a%26b",
+        )
+
+    def test_other_forms_are_ignored(self):
+        page = (
+            '<form id="search" action="/search"><input type="hidden" name="q" value="x"></form>'
+            '<a href="/uc?export=download&amp;confirm=Xq9v&amp;id=OLD">Download anyway</a>'
+        )
+        self.assertEqual(
+            find_drive_confirm_url(page, "https://drive.google.com/uc?export=download&id=OLD"),
+            "https://drive.google.com/uc?export=download&confirm=Xq9v&id=OLD",
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
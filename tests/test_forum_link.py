@@ -0,0 +1,41 @@
+"""
+論壇頁面連結擷取測試
+以保存的巴哈姆特頁面確認串流擷取與 BeautifulSoup 完整解析取得相同的下載連結
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from support import FIXTURES_DIR, make_manager
+from translator import FORUM_CHUNK_SIZE, extract_download_link, stream_extract_download_link
+
+FORUM_FIXTURES = FIXTURES_DIR / "forum"
+DRIVE_ID = "1kQ7nVx3bT9mZr2LpYw8HcFdE4uJs6aGo"
+
+
+def chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+class ForumLinkTest(unittest.TestCase):
+    def test_fixtures(self):
+        pages = sorted(FORUM_FIXTURES.glob("*.html"))
+        self.assertTrue(pages)
+        with tempfile.TemporaryDirectory() as game_dir:
+            manager = make_manager(Path(game_dir))
+            for page in pages:
+                with self.subTest(page.name):
+                    data = page.read_bytes()
+                    link = extract_download_link(data.decode('utf-8'))
+                    self.assertIsNotNone(link)
+                    # 區塊邊界可能切在標籤或多位元組字元中間
+                    for size in (FORUM_CHUNK_SIZE, 1000, 7):
+                        self.assertEqual(stream_extract_download_link(chunks(data, size)), link)
+                    self.assertEqual(manager._convert_gdrive_url(link),
+                                     f"https://drive.google.com/uc?export=download&id={DRIVE_ID}")
+
+
+if __name__ == '__main__':
+    unittest.main()
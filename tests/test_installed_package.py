@@ -0,0 +1,118 @@
+"""
+已安裝版本判斷測試
+論壇的翻譯檔每個版本都同名，確認以翻譯檔的 SHA-256 而不是檔名判斷是否已安裝
+"""
+
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from support import FIXTURES_DIR, PackageServer, make_manager, write_zip
+
+TEXT = "game/citadel/resource/localization/citadel_gc_tchinese.txt"
+
+
+class InstalledPackageTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.game_dir = self.root / "game_root"
+        self.game_dir.mkdir()
+        (self.root / "v1").mkdir()
+        (self.root / "v2").mkdir()
+        self.v1 = write_zip(self.root / "v1" / "taiwan_translation.zip", {TEXT: "你好 v1".encode('utf-8')})
+        self.v2 = write_zip(self.root / "v2" / "taiwan_translation.zip", {TEXT: "你好 v2".encode('utf-8')})
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_same_name_new_version_is_not_installed(self):
+        with PackageServer() as server:
+            server.serve(self.v1)
+            manager = make_manager(self.game_dir, source=server.url)
+            path = manager.download_translation()
+            self.assertTrue(manager.replace_translation_files(path))
+
+            # 預先下載了同名的新版本，但尚未安裝
+            server.serve(self.v2)
+            self.assertIsNotNone(make_manager(self.game_dir, source=server.url).prefetch_translation())
+
+            # 下次啟動時伺服器回應 304，下載目錄中的是尚未安裝的 v2
+            manager = make_manager(self.game_dir, source=server.url)
+            path = manager.download_translation()
+            self.assertTrue(manager.package_not_modified)
+            self.assertFalse(manager.is_package_installed(path))
+
+            self.assertTrue(manager.replace_translation_files(path))
+            self.assertTrue(manager.is_package_installed(path))
+        self.assertEqual((self.game_dir / TEXT).read_text(encoding='utf-8'), "你好 v2")
+
+    def test_modified_files_are_not_installed(self):
+        manager = make_manager(self.game_dir)
+        self.assertTrue(manager.replace_translation_files(self.v1))
+        self.assertTrue(manager.is_package_installed(self.v1))
+
+        (self.game_dir / TEXT).write_text("Steam 更新覆寫", encoding='utf-8')
+        self.assertFalse(manager.is_package_installed(self.v1))
+
+
+class UpToDateTest(unittest.TestCase):
+    """is_up_to_date 不連網判斷時，以版本而不是檔名比對"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.game_dir = self.root / "game_root"
+        gameinfo = self.game_dir / "game" / "citadel" / "gameinfo.gi"
+        gameinfo.parent.mkdir(parents=True)
+        shutil.copyfile(FIXTURES_DIR / "gameinfo" / "ukrainian_last.gi", gameinfo)
+        (self.root / "v1").mkdir()
+        (self.root / "v2").mkdir()
+        self.v1 = write_zip(self.root / "v1" / "taiwan_translation.zip", {TEXT: "你好 v1".encode('utf-8')})
+        self.v2 = write_zip(self.root / "v2" / "taiwan_translation.zip", {TEXT: "你好 v2".encode('utf-8')})
+        self.server = PackageServer().__enter__()
+        self.server.serve(self.v1)
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+        self._tmp.cleanup()
+
+    def manager(self, **options):
+        """論壇連結快取指向本機伺服器的 TranslationManager"""
+        manager = make_manager(self.game_dir, **options)
+        manager.download_dir.mkdir(exist_ok=True)
+        manager.forum_cache_path.write_text(json.dumps({
+            manager.forum_url: {'link': f"{self.server.url}/package", 'resolved_at': time.time()},
+        }), encoding='utf-8')
+        return manager
+
+    def install_v1(self):
+        manager = self.manager()
+        self.assertTrue(manager.replace_translation_files(manager.download_translation()))
+        self.assertTrue(manager.update_gameinfo_language())
+        self.assertTrue(self.manager().is_up_to_date())
+
+    def test_prefetched_same_name_version_is_not_up_to_date(self):
+        self.install_v1()
+
+        self.server.serve(self.v2)
+        self.assertIsNotNone(self.manager().prefetch_translation())
+        self.assertFalse(self.manager().is_up_to_date())
+
+        manager = self.manager()
+        self.assertTrue(manager.replace_translation_files(manager.staged_package(float('inf'))))
+        self.assertTrue(self.manager().is_up_to_date())
+
+    def test_delta_installed_version_is_up_to_date(self):
+        self.install_v1()
+
+        self.server.serve(self.v2)
+        self.assertTrue(self.manager(delta=True).delta_update())
+        self.assertTrue(self.manager().is_up_to_date())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+KeyValues 解析與 gameinfo.gi 修改測試
+對各種 gameinfo.gi 寫法確認加入 "tchinese" "3" 後的內容與預期檔案逐位元組相同
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import keyvalues
+from support import FIXTURES_DIR, make_manager
+
+GAMEINFO_FIXTURES = FIXTURES_DIR / "gameinfo"
+
+# 預期檔案 <名稱>.expected.gi 為加入繁體中文後的完整內容
+VARIANTS = [
+    "ukrainian_last",       # 原本的正規表示式可處理的順序
+    "reordered_comments",   # 語言順序不同，行尾有註解
+    "spaces_conditions",    # 以空白縮排，含 [$WIN32] 條件
+    "crlf_bom",             # CRLF 換行與 UTF-8 BOM
+    "tchinese_present",     # 已有 "TChinese" "1"，只修改數值
+    "already_patched",      # 已啟用，內容不變
+    "empty_block",          # 空的 SupportedLanguages 區段
+    "single_line",          # 整個區段寫在同一行
+    "nested_last",          # 最後一個項目是子區段
+]
+
+
+def read_text(path: Path) -> str:
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+class SetValueTest(unittest.TestCase):
+    def test_variants(self):
+        for name in VARIANTS:
+            with self.subTest(name):
+                text = read_text(GAMEINFO_FIXTURES / f"{name}.gi")
+                languages = keyvalues.find_block(keyvalues.parse(text), "SupportedLanguages")
+                self.assertIsNotNone(languages)
+                if languages.get("tchinese") != "3":
+                    text = keyvalues.set_value(text, languages, "tchinese", "3")
+                self.assertEqual(text, read_text(GAMEINFO_FIXTURES / f"{name}.expected.gi"))
+
+    def test_parse(self):
+        root = keyvalues.parse(read_text(GAMEINFO_FIXTURES / "spaces_conditions.gi"))
+        gameinfo = root.find("gameinfo")
+        self.assertEqual(gameinfo.get("title"), "Deadlock")
+        self.assertEqual(gameinfo.find("FileSystem").find("SearchPaths").get("Game_Language"), "citadel_*LANGUAGE*")
+        languages = keyvalues.find_block(root, "SupportedLanguages")
+        self.assertEqual([child.key for child in languages.children], ["english", "schinese", "russian"])
+
+    def test_malformed(self):
+        for text in ('"GameInfo" {', '"GameInfo" { } }', '"GameInfo" { "title" "Deadlock }', '"GameInfo" { "title" }'):
+            with self.subTest(text):
+                with self.assertRaises(keyvalues.KeyValuesError):
+                    keyvalues.parse(text)
+
+
+class UpdateGameinfoTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.game_dir = Path(self._tmp.name)
+        self.gameinfo = self.game_dir / "game" / "citadel" / "gameinfo.gi"
+        self.gameinfo.parent.mkdir(parents=True)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_variants(self):
+        for name in VARIANTS:
+            with self.subTest(name):
+                shutil.copyfile(GAMEINFO_FIXTURES / f"{name}.gi", self.gameinfo)
+                manager = make_manager(self.game_dir)
+                manager.gameinfo_state_path.unlink(missing_ok=True)
+                self.assertTrue(manager.update_gameinfo_language())
+                self.assertEqual(self.gameinfo.read_bytes(),
+                                 (GAMEINFO_FIXTURES / f"{name}.expected.gi").read_bytes())
+                self.assertTrue(manager.is_gameinfo_patched())
+
+    def test_already_patched_is_not_rewritten(self):
+        shutil.copyfile(GAMEINFO_FIXTURES / "already_patched.gi", self.gameinfo)
+        before = self.gameinfo.stat().st_mtime_ns
+        self.assertTrue(make_manager(self.game_dir).update_gameinfo_language())
+        self.assertEqual(self.gameinfo.stat().st_mtime_ns, before)
+
+    def test_unchanged_file_is_not_read(self):
+        shutil.copyfile(GAMEINFO_FIXTURES / "ukrainian_last.gi", self.gameinfo)
+        self.assertTrue(make_manager(self.game_dir).update_gameinfo_language())
+
+        manager = make_manager(self.game_dir)
+        with mock.patch.object(manager, '_read_gameinfo', side_effect=AssertionError("不應讀取 gameinfo.gi")):
+            self.assertTrue(manager.update_gameinfo_language())
+            self.assertTrue(manager.is_gameinfo_patched())
+
+    def test_restored_file_is_patched_again(self):
+        shutil.copyfile(GAMEINFO_FIXTURES / "ukrainian_last.gi", self.gameinfo)
+        manager = make_manager(self.game_dir)
+        self.assertTrue(manager.update_gameinfo_language())
+
+        # Steam 驗證檔案後還原為原始內容
+        shutil.copyfile(GAMEINFO_FIXTURES / "ukrainian_last.gi", self.gameinfo)
+        self.assertFalse(manager.is_gameinfo_patched())
+        self.assertTrue(manager.update_gameinfo_language())
+        self.assertEqual(self.gameinfo.read_bytes(),
+                         (GAMEINFO_FIXTURES / "ukrainian_last.expected.gi").read_bytes())
+
+    def test_missing_languages_block(self):
+        self.gameinfo.write_text('"GameInfo"\n{\n\tgame\t"citadel"\n}\n', encoding='utf-8')
+        before = self.gameinfo.read_bytes()
+        self.assertFalse(make_manager(self.game_dir).update_gameinfo_language())
+        self.assertEqual(self.gameinfo.read_bytes(), before)
+
+    def test_malformed_file_is_left_alone(self):
+        self.gameinfo.write_text('"GameInfo"\n{\n\tSupportedLanguages\n\t{\n', encoding='utf-8')
+        before = self.gameinfo.read_bytes()
+        self.assertFalse(make_manager(self.game_dir).update_gameinfo_language())
+        self.assertEqual(self.gameinfo.read_bytes(), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+多個下載來源（--mirror）競速測試
+論壇頁面回應緩慢時由鏡像勝出，確認落敗的論壇探測會停止讀取頁面，且不寫入下載連結快取
+"""
+
+import tempfile
+import threading
+import time
+import unittest
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from support import PackageServer, make_manager, write_zip
+from translator import FORUM_CHUNK_SIZE
+
+# 頁面區塊間隔，整頁送完需要數秒，遠久於鏡像回應的時間
+CHUNK_DELAY = 0.2
+CHUNK_COUNT = 20
+
+
+class SlowForumHandler(BaseHTTPRequestHandler):
+    """逐塊緩慢送出論壇頁面，下載連結在最後一塊；記錄實際送出的區塊數"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        padding = b'<p>' + b'x' * FORUM_CHUNK_SIZE + b'</p>'
+        try:
+            for _ in range(self.server.chunk_count):
+                self._write_chunk(padding)
+                self.server.chunks_sent += 1
+                time.sleep(CHUNK_DELAY)
+            self._write_chunk(b'<a href="https://drive.google.com/file/d/FORUM/view">')
+            self._write_chunk(b'')
+        except OSError:
+            # 用戶端已關閉連線
+            pass
+        finally:
+            self.server.finished.set()
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f'{len(data):x}\r\n'.encode('ascii') + data + b'\r\n')
+        self.wfile.flush()
+
+
+class RaceSourcesTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.game_dir = self.root / "game_root"
+        self.game_dir.mkdir()
+        self.package = write_zip(self.root / "taiwan_translation.zip", {
+            "game/citadel/resource/localization/citadel_gc_tchinese.txt": "翻譯".encode('utf-8'),
+        }, zipfile.ZIP_STORED)
+
+        self.forum = ThreadingHTTPServer(('127.0.0.1', 0), SlowForumHandler)
+        self.forum.daemon_threads = True
+        self.forum.chunk_count = CHUNK_COUNT
+        self.forum.chunks_sent = 0
+        self.forum.finished = threading.Event()
+        threading.Thread(target=self.forum.serve_forever, daemon=True).start()
+        # 網址包含 gamer.com.tw 才會被當作論壇頁面解析
+        self.forum_url = f"http://127.0.0.1:{self.forum.server_address[1]}/forum.gamer.com.tw/C.php"
+
+    def tearDown(self):
+        self.forum.shutdown()
+        self.forum.server_close()
+        self._tmp.cleanup()
+
+    def test_losing_forum_probe_stops_without_writing_cache(self):
+        with PackageServer() as mirror:
+            mirror.serve(self.package)
+            mirror_url = f"{mirror.url}/package"
+            manager = make_manager(self.game_dir, mirror=[mirror_url])
+            manager.forum_url = self.forum_url
+            manager.download_dir.mkdir()
+
+            self.assertEqual(manager._resolve_download_url(), mirror_url)
+
+        # 論壇探測在下一個區塊前停止並關閉連線，不會讀完整頁
+        self.assertTrue(self.forum.finished.wait(CHUNK_DELAY * 5))
+        self.assertLess(self.forum.chunks_sent, CHUNK_COUNT)
+        self.assertFalse(manager.forum_cache_path.exists())
+        self.assertEqual(list(manager.download_dir.glob('*.tmp')), [])
+
+        # 中止的論壇探測不記為失敗
+        latencies = manager._read_json_file(manager.source_latency_path)
+        self.assertEqual(latencies[mirror_url]['failures'], 0)
+        self.assertNotIn('failures', latencies.get(self.forum_url, {}))
+
+    def test_forum_link_is_cached_when_not_cancelled(self):
+        self.forum.chunk_count = 2
+        manager = make_manager(self.game_dir)
+        manager.download_dir.mkdir()
+
+        link = manager._resolve_forum_link(self.forum_url, threading.Event())
+
+        self.assertEqual(link, "https://drive.google.com/file/d/FORUM/view")
+        cache = manager._read_json_file(manager.forum_cache_path)
+        self.assertEqual(cache[self.forum_url]['link'], link)
+
+
+if __name__ == '__main__':
+    unittest.main()
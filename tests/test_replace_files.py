@@ -0,0 +1,59 @@
+"""
+替換翻譯檔案測試
+確認無法安裝的翻譯檔不會移除目前安裝的檔案
+"""
+
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from support import make_manager, write_zip
+
+TEXT = "game/citadel/resource/localization/citadel_gc_tchinese.txt"
+
+
+class ReplaceFilesTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.game_dir = self.root / "game_root"
+        self.game_dir.mkdir()
+        self.manager = make_manager(self.game_dir)
+        package = write_zip(self.root / "taiwan_translation.zip", {TEXT: "你好".encode('utf-8')})
+        self.assertTrue(self.manager.replace_translation_files(package))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def assert_installed(self):
+        self.assertEqual((self.game_dir / TEXT).read_text(encoding='utf-8'), "你好")
+        self.assertEqual(set(self.manager._load_install_manifest()['files']), {TEXT})
+
+    def test_unsupported_package_is_rejected(self):
+        package = self.root / "pkg.rar"
+        package.write_bytes(b"Rar!\x1a\x07\x00")
+        self.assertFalse(self.manager.replace_translation_files(package))
+        self.assert_installed()
+
+    def test_empty_package_keeps_installed_files(self):
+        empty = self.root / "empty.zip"
+        zipfile.ZipFile(empty, 'w').close()
+        self.assertFalse(self.manager.replace_translation_files(empty))
+        self.assert_installed()
+
+        empty_dir = self.root / "empty_dir"
+        empty_dir.mkdir()
+        self.assertFalse(self.manager.replace_translation_files(empty_dir))
+        self.assert_installed()
+
+    def test_directory_package_is_installed(self):
+        source = self.root / "translation"
+        (source / TEXT).parent.mkdir(parents=True)
+        (source / TEXT).write_text("你好 資料夾", encoding='utf-8')
+        self.assertTrue(self.manager.replace_translation_files(source))
+        self.assertEqual((self.game_dir / TEXT).read_text(encoding='utf-8'), "你好 資料夾")
+
+
+if __name__ == '__main__':
+    unittest.main()
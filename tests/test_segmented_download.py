@@ -0,0 +1,71 @@
+"""
+分段下載（--download_connections）測試
+以支援與不支援 Range 的本機伺服器下載，確認組合後的檔案與原檔逐位元組相同
+"""
+
+import os
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from support import PackageServer, make_manager, write_zip
+from translator import SEGMENT_MIN_SIZE
+
+
+class SegmentedDownloadTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        # 每個分段至少 SEGMENT_MIN_SIZE，四條連線需要四倍大小；隨機內容不壓縮，保持檔案大小
+        cls.package = write_zip(Path(cls._tmp.name) / "taiwan_translation.zip", {
+            "game/citadel/resource/data.bin": os.urandom(4 * SEGMENT_MIN_SIZE + 1024 * 1024),
+            "game/citadel/resource/localization/citadel_gc_tchinese.txt": "翻譯".encode('utf-8'),
+        }, zipfile.ZIP_STORED)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
+    def setUp(self):
+        self._game = tempfile.TemporaryDirectory()
+        self.game_dir = Path(self._game.name)
+
+    def tearDown(self):
+        self._game.cleanup()
+
+    def download(self, server: PackageServer, connections: int) -> Path | None:
+        server.serve(self.package)
+        manager = make_manager(self.game_dir, source=server.url, download_connections=connections)
+        return manager.download_translation()
+
+    def assert_downloaded(self, path: Path | None):
+        self.assertIsNotNone(path)
+        self.assertEqual(path.read_bytes(), self.package.read_bytes())
+        leftovers = [p.name for p in path.parent.iterdir() if '.part' in p.name]
+        self.assertEqual(leftovers, [])
+
+    def test_segments_are_assembled_byte_exact(self):
+        with PackageServer() as server:
+            path = self.download(server, connections=4)
+
+        self.assert_downloaded(path)
+        # 第一段沿用第一個請求的回應，其餘三段各自以 Range 請求下載，合起來涵蓋到檔案結尾
+        gets = [header for method, _, header in server.requests if method == 'GET']
+        self.assertEqual(len(gets), 4)
+        self.assertIsNone(gets[0])
+        ranges = sorted(tuple(int(n) for n in header[len('bytes='):].split('-')) for header in gets[1:])
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(start, end + 1)
+        self.assertEqual(ranges[-1][1], self.package.stat().st_size - 1)
+
+    def test_falls_back_without_range_support(self):
+        with PackageServer(ranges=False) as server:
+            path = self.download(server, connections=4)
+
+        self.assert_downloaded(path)
+        self.assertEqual([(method, header) for method, _, header in server.requests], [('GET', None)])
+
+
+if __name__ == '__main__':
+    unittest.main()
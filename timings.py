@@ -0,0 +1,121 @@
+"""
+各步驟耗時記錄
+以巢狀的計時區段記錄更新流程中每個步驟的時間、傳輸與寫入量，可輸出為 JSON 供彙整分析
+"""
+
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class Span:
+    """一個計時區段：耗時、下載位元組數、寫入位元組數與處理的檔案數"""
+
+    def __init__(self, name: str, parent: 'Span | None', offset: float):
+        self.name = name
+        self.parent = parent
+        self.offset = offset
+        self.wall = 0.0
+        self.bytes_transferred = 0
+        self.bytes_written = 0
+        self.files_touched = 0
+        self.status = 'ok'
+        self._lock = threading.Lock()
+
+    def add(self, bytes_transferred: int = 0, bytes_written: int = 0, files_touched: int = 0) -> None:
+        """累加統計數字（可由工作執行緒呼叫）"""
+        with self._lock:
+            self.bytes_transferred += bytes_transferred
+            self.bytes_written += bytes_written
+            self.files_touched += files_touched
+
+    def path(self) -> str:
+        """由最外層到此區段的名稱，例如 update/install/stage"""
+        names = []
+        span = self
+        while span:
+            names.append(span.name)
+            span = span.parent
+        return '/'.join(reversed(names))
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.path(),
+            'start': round(self.offset, 6),
+            'wall': round(self.wall, 6),
+            'bytes_transferred': self.bytes_transferred,
+            'bytes_written': self.bytes_written,
+            'files_touched': self.files_touched,
+            'status': self.status,
+        }
+
+
+class Timings:
+    """收集一次執行中的所有計時區段
+
+    區段依執行緒各自巢狀；子區段結束時將統計數字累加到上層區段。
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def current(self) -> Span | None:
+        """目前執行緒最內層的區段"""
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, name: str):
+        """記錄 with 區塊的耗時，回傳的 Span 可用 add() 累加統計數字"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        span = Span(name, stack[-1] if stack else None, time.perf_counter() - self._started)
+        with self._lock:
+            self._spans.append(span)
+        stack.append(span)
+        t0 = time.perf_counter()
+        try:
+            yield span
+        except BaseException:
+            span.status = 'error'
+            raise
+        finally:
+            span.wall = time.perf_counter() - t0
+            stack.pop()
+            if span.parent:
+                span.parent.add(span.bytes_transferred, span.bytes_written, span.files_touched)
+
+    def add(self, bytes_transferred: int = 0, bytes_written: int = 0, files_touched: int = 0) -> None:
+        """累加到目前執行緒最內層的區段，沒有區段時忽略"""
+        span = self.current()
+        if span:
+            span.add(bytes_transferred, bytes_written, files_touched)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = [span.to_dict() for span in self._spans]
+        return {
+            'started_at': self.started_at,
+            'host': platform.node(),
+            'platform': sys.platform,
+            'argv': sys.argv[1:],
+            'total': round(time.perf_counter() - self._started, 6),
+            'spans': spans,
+        }
+
+    def write_json(self, path: Path) -> None:
+        """將所有區段寫入 JSON 檔案"""
+        tmp_path = Path(f"{path}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
@@ -4,21 +4,310 @@
 """
 
 import argparse
+import codecs
+import hashlib
+import html
+import json
 import logging
+import os
 import re
 import shutil
 import subprocess
 import zipfile
 from pathlib import Path
-from urllib.parse import urlparse, parse_qs, unquote_to_bytes, unquote
+from typing import Iterable
+from urllib.parse import urlparse, parse_qs, unquote_to_bytes, unquote, urlencode, urljoin
 from email.header import decode_header
 import sys
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import requests
-from bs4 import BeautifulSoup
+# requests 與 bs4 載入較慢，只在實際連網或解析 HTML 時才在函式內載入
+
+import keyvalues
+from remote_zip import RemoteZipError, RemoteZipSource
+from timings import Timings
 
 logger = logging.getLogger(__name__)
 
+# 安裝清單檔名（記錄已安裝檔案的大小、修改時間與雜湊，用於增量安裝）
+INSTALL_MANIFEST_FILENAME = "deadlock_translator_manifest.json"
+INSTALL_MANIFEST_VERSION = 1
+
+# 檔案讀寫的緩衝區大小
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Linux 的 reflink ioctl（FICLONE）
+FICLONE = 0x40049409
+
+# 論壇頁面串流讀取的區塊大小
+FORUM_CHUNK_SIZE = 16 * 1024
+
+# 分段下載：每段最小大小與讀取區塊大小
+SEGMENT_MIN_SIZE = 4 * 1024 * 1024
+SEGMENT_CHUNK_SIZE = 256 * 1024
+
+# 單一連線下載：每次讀取的大小依讀取耗時在上下限之間調整，目標為每次約 0.1 秒
+DOWNLOAD_CHUNK_MIN = 256 * 1024
+DOWNLOAD_CHUNK_MAX = 16 * 1024 * 1024
+DOWNLOAD_CHUNK_TARGET = 0.1
+
+# 下載進度回報的最短間隔（秒）
+PROGRESS_INTERVAL = 1.0
+
+# 下載開始時讀取的位元組數，用來判斷回應是 zip 還是 HTML 頁面
+SNIFF_SIZE = 4 * 1024
+# Google Drive 確認頁面最多讀取的大小，與最多跟隨的次數
+CONFIRM_PAGE_MAX_SIZE = 512 * 1024
+CONFIRM_MAX_HOPS = 2
+
+# 多個下載來源：依記錄的延遲排序後，每個來源比前一個晚這麼多秒開始探測
+PROBE_STAGGER = 0.2
+# 來源延遲記錄的平滑係數（新測量值所佔的比例）
+LATENCY_SMOOTHING = 0.3
+
+# gameinfo.gi 中要啟用的語言與其旗標
+GAMEINFO_LANGUAGE = "tchinese"
+GAMEINFO_LANGUAGE_FLAGS = "3"
+
+
+# 論壇頁面中 <a> 標籤的 href 屬性（未加引號的值必須已看到結尾，避免串流時截斷）
+_ANCHOR_HREF_PATTERN = re.compile(
+    r"""<a\b[^>]*?\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)(?=[\s>]))""",
+    re.IGNORECASE,
+)
+
+
+def _match_download_href(href: str) -> str | None:
+    """判斷連結是否指向 Google Drive（包含 Gamer 轉址），回傳下載連結"""
+    # 直接包含 Google Drive 的連結
+    if 'drive.google.com' in href or 'docs.google.com' in href:
+        logger.info(f"找到 Google Drive 連結: {href}")
+        return href
+
+    # 處理 Gamer 轉向 (ref.gamer.com.tw/redir.php?url=ENCODED_URL)
+    try:
+        parsed_href = urlparse(href)
+        # 檢查是否為轉址路徑或主機
+        if 'redir.php' in parsed_href.path or 'ref.gamer.com.tw' in parsed_href.netloc:
+            qs = parse_qs(parsed_href.query)
+            if 'url' in qs and qs['url']:
+                decoded = unquote(qs['url'][0])
+                if 'drive.google.com' in decoded or 'docs.google.com' in decoded:
+                    logger.info(f"從轉址連結解析到 Google Drive: {decoded}")
+                    return decoded
+    except Exception:
+        # 忽略解析錯誤，繼續搜尋其他連結
+        pass
+    return None
+
+
+def extract_download_link(page: str) -> str | None:
+    """以 BeautifulSoup 解析完整論壇頁面 HTML，找出 Google Drive 連結"""
+    try:
+        from bs4 import BeautifulSoup
+
+        # 使用 BeautifulSoup 解析 HTML
+        soup = BeautifulSoup(page, 'html.parser')
+        
+        # 尋找 Google Drive 連結
+        # 模式 1: 直接的連結標籤
+        for link in soup.find_all('a', href=True):
+            found = _match_download_href(link.get('href', ''))
+            if found:
+                return found
+        
+        # 模式 2: 文本中的 URL
+        text_content = soup.get_text()
+        gdrive_pattern = r'https://drive\.google\.com/[^\s<>"{}|\\^`\[\]]+'
+        matches = re.findall(gdrive_pattern, text_content)
+        if matches:
+            logger.info(f"從文本中找到 Google Drive 連結: {matches[0]}")
+            return matches[0]
+        
+        logger.warning("無法從論壇頁面找到 Google Drive 連結")
+        return None
+        
+    except Exception as e:
+        logger.error(f"解析論壇頁面失敗: {str(e)}")
+        return None
+
+
+def stream_extract_download_link(chunks: Iterable[bytes], encoding: str = 'utf-8') -> str | None:
+    """邊接收邊掃描論壇頁面的 <a href>，找到下載連結就停止讀取
+
+    整頁都沒有符合的連結時，才對已讀取的內容使用 extract_download_link 的完整解析。
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    buffer = ''
+    scan_from = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += decoder.decode(chunk)
+
+        last_end = scan_from
+        for m in _ANCHOR_HREF_PATTERN.finditer(buffer, scan_from):
+            href = html.unescape(m.group(1) or m.group(2) or m.group(3) or '')
+            found = _match_download_href(href)
+            if found:
+                return found
+            last_end = m.end()
+
+        # 從最後一個尚未完整的標籤開始繼續掃描（可能跨越兩個區塊）
+        pending = buffer.rfind('<', last_end)
+        scan_from = pending if pending != -1 else len(buffer)
+
+    buffer += decoder.decode(b'', final=True)
+    return extract_download_link(buffer)
+
+
+def looks_like_html(prefix: bytes, content_type: str = '') -> bool:
+    """回應開頭的內容（或 Content-Type）是否為 HTML 頁面"""
+    if prefix.startswith(b'PK'):
+        return False
+    if 'text/html' in (content_type or '').lower():
+        return True
+    head = prefix.lstrip(b'\xef\xbb\xbf \t\r\n')[:64].lower()
+    return head.startswith((b'<!doctype html', b'<html', b'<head', b'<body'))
+
+
+def _tag_attributes(tag: str) -> dict[str, str]:
+    """解析 HTML 標籤內的屬性（不依賴屬性順序與引號種類），屬性名稱轉為小寫"""
+    attrs = {}
+    for m in re.finditer(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))', tag):
+        value = next(v for v in m.groups()[1:] if v is not None)
+        attrs[m.group(1).lower()] = html.unescape(value)
+    return attrs
+
+
+def find_drive_confirm_url(page: str, base_url: str, cookies: dict | None = None) -> str | None:
+    """從 Google Drive 的病毒掃描確認頁面找出實際下載檔案的網址
+
+    支援新版頁面的 <form id="download-form">（隱藏欄位 id、export、confirm、uuid）、
+    舊版頁面中帶 confirm= 參數的連結，以及 download_warning cookie。
+    """
+    for form in re.finditer(r'<form\b([^>]*)>(.*?)</form>', page, re.IGNORECASE | re.DOTALL):
+        form_attrs = _tag_attributes(form.group(1))
+        if form_attrs.get('id') != 'download-form':
+            continue
+        fields = []
+        for tag in re.findall(r'<input\b([^>]*)>', form.group(2), re.IGNORECASE):
+            attrs = _tag_attributes(tag)
+            if attrs.get('type', '').lower() == 'hidden' and 'name' in attrs:
+                fields.append((attrs['name'], attrs.get('value', '')))
+        if form_attrs.get('action') and fields:
+            # 與瀏覽器送出 GET 表單相同，以欄位取代 action 原有的查詢字串
+            action = urljoin(base_url, form_attrs['action']).split('?', 1)[0]
+            return f"{action}?{urlencode(fields)}"
+
+    link = re.search(r'href="([^"]*[?&](?:amp;)?confirm=[^"]*)"', page, re.IGNORECASE)
+    if link:
+        return urljoin(base_url, html.unescape(link.group(1)))
+
+    for name, value in (cookies or {}).items():
+        if name.startswith('download_warning'):
+            separator = '&' if '?' in base_url else '?'
+            return f"{base_url}{separator}confirm={value}"
+    return None
+
+
+def _prefixed_reader(prefix: bytes, read):
+    """回傳 read(n) 函式：先傳回已讀取的 prefix，之後再從 read 讀取"""
+    def reader(n: int) -> bytes:
+        nonlocal prefix
+        if prefix:
+            chunk, prefix = prefix[:n], prefix[n:]
+            return chunk
+        return read(n)
+    return reader
+
+
+def stream_to_file(read, f, sha, downloaded: int = 0, total_size: int = 0, progress=None) -> int:
+    """以 read(n) 讀取資料寫入 f 並更新 sha，回傳累計的下載位元組數（downloaded 為已下載的部分）
+
+    讀取大小從 1 MiB 開始，讀得快就加倍、讀得慢就減半；
+    progress(已下載, 總大小, 每秒位元組數, 剩餘秒數或 None) 最多每 PROGRESS_INTERVAL 秒呼叫一次。
+    """
+    chunk_size = 1024 * 1024
+    started = last_report = time.monotonic()
+    start_bytes = downloaded
+    while True:
+        t0 = time.monotonic()
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        f.write(chunk)
+        sha.update(chunk)
+        downloaded += len(chunk)
+
+        now = time.monotonic()
+        if len(chunk) == chunk_size:
+            elapsed = now - t0
+            if elapsed < DOWNLOAD_CHUNK_TARGET / 2 and chunk_size < DOWNLOAD_CHUNK_MAX:
+                chunk_size *= 2
+            elif elapsed > DOWNLOAD_CHUNK_TARGET * 2 and chunk_size > DOWNLOAD_CHUNK_MIN:
+                chunk_size //= 2
+
+        if progress and now - last_report >= PROGRESS_INTERVAL:
+            last_report = now
+            rate = (downloaded - start_bytes) / (now - started)
+            eta = (total_size - downloaded) / rate if total_size and rate > 0 else None
+            progress(downloaded, total_size, rate, eta)
+    return downloaded
+
+
+class InstallCancelledError(Exception):
+    """安裝步驟被取消（例如已超過啟動延遲上限，遊戲已啟動）"""
+
+
+class FileLock:
+    """跨程序的檔案鎖（Windows 使用 msvcrt，其他平台使用 fcntl）"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+
+    def acquire(self, timeout: float = 0) -> bool:
+        """嘗試取得鎖，最多等待 timeout 秒，成功回傳 True"""
+        deadline = time.monotonic() + timeout
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        f = open(self.path, 'a+b')
+        while True:
+            try:
+                if sys.platform == 'win32':
+                    import msvcrt
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    import fcntl
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                self._file = f
+                return True
+            except OSError:
+                if time.monotonic() >= deadline:
+                    f.close()
+                    return False
+                time.sleep(0.1)
+
+    def release(self) -> None:
+        """釋放鎖"""
+        if self._file is None:
+            return
+        try:
+            if sys.platform == 'win32':
+                import msvcrt
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
 
 class TranslationManager:
     """翻譯下載和替換管理器"""
@@ -28,7 +317,22 @@ class TranslationManager:
         self.forum_url = "https://forum.gamer.com.tw/C.php?bsn=80911&snA=76"
         self.download_timeout = 30
         self.auto_launch = args.auto_launch if args.auto_launch is not None else True
+        self.install_workers = args.install_workers if args.install_workers else (os.cpu_count() or 1)
+        self.download_connections = max(1, args.download_connections or 1)
+        self.forum_cache_ttl = args.forum_cache_ttl
+        self.refresh = args.refresh
+        self.verify_mode = args.verify
+        self.delta_enabled = args.delta
+        # 區域網路快取伺服器（--source），設定時不連線論壇與 Google Drive
+        self.source = (args.source or '').rstrip('/')
+        # 論壇以外的下載來源（--mirror）：drive:<檔案 ID>、HTTP 網址或本機資料夾
+        self.mirrors = args.mirror or []
+        self.cache_max_bytes = args.cache_max_bytes
+        self.cache_max_versions = args.cache_max_versions
         self.translation_filename = "taiwan_translation.zip"
+
+        # 各步驟的耗時與傳輸量（--timings）
+        self.timings = Timings()
         
         # 自動偵測遊戲路徑
         self.deadlock_path = self._detect_deadlock_path()
@@ -36,117 +340,373 @@ class TranslationManager:
         # 使用遊戲根目錄作為工作目錄
         self.work_dir = self.deadlock_path
 
-        # 下載目錄（所有翻譯檔統一下載到此處）
+        # 下載目錄（所有翻譯檔統一下載到此處，第一次連網時才建立）
         self.download_dir = self.work_dir / "downloads"
-        self.download_dir.mkdir(parents=True, exist_ok=True)
+
+        # 取消安裝的旗標（遊戲啟動後不能再寫入遊戲檔案）
+        self._install_cancel = threading.Event()
+        # 換入遊戲目錄期間持有，取消時等待換入完成，避免遊戲讀到新舊混合的檔案
+        self._commit_lock = threading.Lock()
+
+        # 所有 HTTP 請求共用同一個連線池（keep-alive），避免重複的 TLS 交握；第一次連網時才建立
+        self._session = None
+        self._session_lock = threading.Lock()
+
+        # 論壇頁面解析結果快取
+        self.forum_cache_path = self.download_dir / "forum_cache.json"
+
+        # 上次下載的驗證資訊（用於條件式請求）
+        self.validators_path = self.download_dir / "download_validators.json"
+        self.package_not_modified = False
+        # 伺服器回應 304 時沿用的驗證資訊，用來判斷該版本是否就是已安裝的版本
+        self.not_modified_validators = None
+
+        # 預先下載（--prefetch）完成並驗證過的翻譯檔記錄
+        self.staged_path = self.download_dir / "staged.json"
+
+        # 預先下載程序與啟動程序共用的鎖，避免同時寫入下載目錄與遊戲檔案
+        self.download_lock = FileLock(self.download_dir / "deadlock_translator.lock")
+
+        # 安裝時的暫存區與上一個版本的備份
+        self.staging_dir = self.download_dir / "staging"
+        self.rollback_dir = self.download_dir / "rollback"
+
+        # 各下載來源的回應延遲（用於決定下次的探測順序）
+        self.source_latency_path = self.download_dir / "source_latency.json"
+
+        # 下載目錄中各翻譯檔最後使用的時間（用於快取淘汰）
+        self.cache_index_path = self.download_dir / "cache_index.json"
+
+        # 安裝清單（放在遊戲根目錄）
+        self.manifest_path = self.deadlock_path / INSTALL_MANIFEST_FILENAME
+
+        # gameinfo.gi 與上次修改後的檔案狀態（未變動時不需重新讀取）
+        self.gameinfo_path = self.deadlock_path / "game" / "citadel" / "gameinfo.gi"
+        self.gameinfo_state_path = self.download_dir / "gameinfo_state.json"
     
+    @property
+    def session(self) -> 'requests.Session':
+        """共用的 HTTP session（第一次使用時才載入 requests 並建立）"""
+        with self._session_lock:
+            if self._session is None:
+                self._session = self._create_session()
+            return self._session
+
+    def _create_session(self) -> 'requests.Session':
+        """建立共用的 HTTP session，並記錄每個請求的延遲"""
+        import requests
+
+        session = requests.Session()
+        session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(10, self.download_connections))
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.hooks['response'].append(self._log_request_latency)
+        return session
+
+    def _log_request_latency(self, response, *args, **kwargs):
+        """記錄請求從送出到收到回應標頭的時間"""
+        elapsed_ms = response.elapsed.total_seconds() * 1000
+        logger.info(f"HTTP {response.request.method} {response.url} -> {response.status_code} ({elapsed_ms:.0f} ms)")
+
+    def cancel_install(self) -> None:
+        """取消尚未完成的安裝，其餘檔案留待下次安裝
+
+        正在換入遊戲目錄時會等待換入完成才返回；返回後遊戲目錄不會再被寫入。
+        """
+        with self._commit_lock:
+            self._install_cancel.set()
+
+    def install_cancelled(self) -> bool:
+        """安裝是否已被取消"""
+        return self._install_cancel.is_set()
+
+    def _check_install_cancelled(self) -> None:
+        """安裝已被取消時中止目前的步驟"""
+        if self._install_cancel.is_set():
+            raise InstallCancelledError("安裝已取消")
+
     def _detect_deadlock_path(self) -> Path:
         """獲取遊戲路徑（使用當前目錄）"""
         logger.info(f"使用當前目錄作為遊戲路徑: {Path.cwd()}")
         return Path.cwd()
     
-    def download_translation(self) -> Path | None:
-        """下載翻譯檔案"""
-        try:
-            logger.info(f"從論壇分析翻譯: {self.forum_url}")
-            
-            # 如果論壇 URL 是巴哈姆特論壇，先解析頁面取得 Google Drive 連結
-            download_url = self.forum_url
-            if 'gamer.com.tw' in self.forum_url or 'bahamut.com.tw' in self.forum_url:
-                logger.info("偵測到論壇連結，嘗試解析頁面...")
-                parsed_url = self._parse_forum_page(self.forum_url)
-                if parsed_url:
-                    download_url = parsed_url
-                    logger.info(f"成功解析論壇頁面，取得: {download_url}")
-                else:
-                    logger.warning("無法從論壇頁面解析下載連結，使用預設 URL")
-            
-            # 如果是 Google Drive 連結，轉換為直接下載 URL
-            if 'drive.google.com' in download_url or 'docs.google.com' in download_url:
-                download_url = self._convert_gdrive_url(download_url)
-            
-            logger.info(f"開始下載: {download_url}")
+    def _resolve_download_url(self) -> str:
+        """從論壇網址解析出實際的下載網址"""
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+
+        # 由區域網路快取伺服器下載
+        if self.source:
+            from lan_cache import PACKAGE_PATH
+
+            logger.info(f"使用區域網路快取: {self.source}")
+            return self.source + PACKAGE_PATH
 
-            # 先嘗試 HEAD 取得檔名與大小（某些伺服器可能不支援 HEAD）
-            filename = None
-            total_size = 0
+        # 設定了其他來源時同時探測，使用最先回應的來源
+        if self.mirrors:
+            download_url = self._race_sources([self.forum_url] + self.mirrors)
+            if download_url:
+                return download_url
+            logger.warning("所有下載來源都沒有回應，改用論壇連結")
+
+        logger.info(f"從論壇分析翻譯: {self.forum_url}")
+        
+        # 如果論壇 URL 是巴哈姆特論壇，先解析頁面取得 Google Drive 連結
+        download_url = self.forum_url
+        if 'gamer.com.tw' in self.forum_url or 'bahamut.com.tw' in self.forum_url:
+            logger.info("偵測到論壇連結，嘗試解析頁面...")
+            with self.timings.span('forum'):
+                parsed_url = self._resolve_forum_link(self.forum_url)
+            if parsed_url:
+                download_url = parsed_url
+                logger.info(f"成功解析論壇頁面，取得: {download_url}")
+            else:
+                logger.warning("無法從論壇頁面解析下載連結，使用預設 URL")
+        
+        # 如果是 Google Drive 連結，轉換為直接下載 URL
+        if 'drive.google.com' in download_url or 'docs.google.com' in download_url:
+            download_url = self._convert_gdrive_url(download_url)
+        return download_url
+
+    def _resolve_source(self, source: str, cancelled: threading.Event | None = None) -> str | None:
+        """將下載來源轉為下載網址；本機資料夾回傳其中最新的 zip 的 file:// 網址
+
+        cancelled 設定後停止讀取論壇頁面，且不寫入下載連結快取。
+        """
+        if source.startswith('drive:'):
+            return f"https://drive.google.com/uc?export=download&id={source[len('drive:'):]}"
+
+        if source.startswith(('http://', 'https://')):
+            if 'gamer.com.tw' in source or 'bahamut.com.tw' in source:
+                source = self._resolve_forum_link(source, cancelled)
+                if not source:
+                    return None
+            if 'drive.google.com' in source or 'docs.google.com' in source:
+                return self._convert_gdrive_url(source)
+            return source
+
+        directory = Path(source.removeprefix('dir:'))
+        packages = sorted(directory.glob('*.zip'), key=lambda p: p.stat().st_mtime, reverse=True)
+        return packages[0].resolve().as_uri() if packages else None
+
+    def _probe_source(self, source: str, cancelled: threading.Event | None = None) -> str | None:
+        """解析來源並確認可以下載，回傳下載網址；無法使用或 cancelled 已設定時回傳 None"""
+        download_url = self._resolve_source(source, cancelled)
+        if cancelled is not None and cancelled.is_set():
+            return None
+        if not download_url or download_url.startswith('file:'):
+            return download_url
+
+        # 只要求第一個位元組，確認伺服器有回應且檔案存在
+        response = self.session.get(
+            download_url, timeout=self.download_timeout, stream=True, headers={'Range': 'bytes=0-0'}
+        )
+        response.close()
+        if response.status_code not in (200, 206):
+            logger.info(f"下載來源無法使用 (HTTP {response.status_code}): {source}")
+            return None
+        return download_url
+
+    def _race_sources(self, sources: list[str]) -> str | None:
+        """同時探測多個下載來源，回傳最先回應的來源的下載網址
+
+        依上次記錄的延遲排序，較快的來源先開始，其餘依序晚 PROBE_STAGGER 秒開始。
+        有來源回應後設定 decided：尚未開始的探測直接取消；進行中的探測在下一個區塊或請求前停止，
+        不寫入下載連結快取，也不記為失敗。已送出的請求仍會等到回應或逾時才結束，但不阻擋結果回傳。
+        """
+        latencies = self._read_json_file(self.source_latency_path)
+        sources = sorted(sources, key=lambda src: latencies.get(src, {}).get('latency', 0))
+        logger.info(f"探測 {len(sources)} 個下載來源: {', '.join(sources)}")
+
+        decided = threading.Event()
+        started = {}
+        results = {}
+
+        def probe(index: int, source: str):
+            if decided.wait(index * PROBE_STAGGER):
+                return None
+            started[source] = time.monotonic()
             try:
-                head_resp = requests.head(
-                    download_url,
-                    timeout=self.download_timeout,
-                    headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'},
-                    allow_redirects=True
+                download_url = self._probe_source(source, decided)
+            except Exception as e:
+                logger.info(f"下載來源無法使用: {source} ({str(e)})")
+                download_url = None
+            if decided.is_set() and not download_url:
+                # 已有其他來源勝出而中止，不算是來源無法使用
+                return None
+            results[source] = (download_url, time.monotonic() - started[source])
+            return download_url
+
+        executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='probe')
+        futures = {executor.submit(probe, index, source): source for index, source in enumerate(sources)}
+        winner = None
+        try:
+            for future in as_completed(futures):
+                if future.result():
+                    winner = futures[future]
+                    break
+        finally:
+            decided.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self._record_source_latencies(latencies, results, started, winner)
+        if not winner:
+            return None
+        download_url, elapsed = results[winner]
+        logger.info(f"使用下載來源: {winner}（{elapsed * 1000:.0f} ms）")
+        return download_url
+
+    def _record_source_latencies(self, latencies: dict, results: dict, started: dict, winner: str | None) -> None:
+        """更新各來源的延遲記錄；尚未回應的來源至少記為目前已等待的時間"""
+        now = time.monotonic()
+        for source, start in list(started.items()):
+            entry = latencies.setdefault(source, {})
+            result = results.get(source)
+            if result and result[0]:
+                previous = entry.get('latency')
+                observed = result[1]
+                entry['latency'] = observed if previous is None else (
+                    previous * (1 - LATENCY_SMOOTHING) + observed * LATENCY_SMOOTHING
                 )
-                if head_resp.ok:
-                    total_size = int(head_resp.headers.get('content-length', 0) or 0)
-                    filename = self._extract_filename_from_headers(head_resp.headers, head_resp.url)
-            except Exception:
-                # 若 HEAD 失敗，繼續使用 GET 來取得資訊
-                filename = None
-
-            # 再嘗試從 URL 或預設名稱推斷檔名
-            if not filename:
-                try:
-                    parsed = urlparse(download_url)
-                    candidate = Path(parsed.path).name
-                    if candidate:
-                        filename = candidate
-                except Exception:
-                    filename = None
+                entry['failures'] = 0
+            elif result:
+                # 無法使用的來源排到最後
+                entry['failures'] = entry.get('failures', 0) + 1
+                entry['latency'] = max(entry.get('latency', 0), self.download_timeout)
+            else:
+                entry['latency'] = max(entry.get('latency', 0), now - start)
+            entry['updated_at'] = time.time()
+        try:
+            self._write_json_atomic(self.source_latency_path, latencies)
+        except OSError as e:
+            logger.warning(f"無法寫入下載來源延遲記錄: {str(e)}")
 
-            # 最後回退到預設檔名
-            if not filename:
-                filename = self.translation_filename
+    def _copy_local_package(self, download_url: str) -> Path | None:
+        """將本機資料夾來源（file:// 網址）中的翻譯檔複製到下載目錄並驗證"""
+        from urllib.request import url2pathname
 
-            # 下載目標路徑（保留原始檔名，不重新命名）
-            download_path = self.download_dir / filename
+        source_file = Path(url2pathname(urlparse(download_url).path))
+        download_path = self.download_dir / source_file.name
+        st = source_file.stat()
+        try:
+            current = download_path.stat()
+            unchanged = current.st_size == st.st_size and current.st_mtime_ns == st.st_mtime_ns
+        except OSError:
+            unchanged = False
 
-            # 如果檔案已存在且通過驗證，跳過下載
-            if download_path.exists():
-                logger.info(f"發現已存在的下載檔案: {download_path}，準備驗證...")
-                if self._validate_download(download_path):
-                    logger.info(f"檔案驗證成功，跳過下載: {download_path}")
-                    return download_path
-                else:
-                    logger.warning(f"已存在檔案驗證失敗，將重新下載: {download_path}")
-
-            # 建立下載請求（實際讀取內容）
-            response = requests.get(
-                download_url,
-                timeout=self.download_timeout,
-                stream=True,
-                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'},
-                allow_redirects=True
-            )
-            response.raise_for_status()
+        if not unchanged:
+            logger.info(f"從本機資料夾複製: {source_file}")
+            tmp_path = download_path.with_name(download_path.name + '.copy.tmp')
+            shutil.copy2(source_file, tmp_path)
+            self.timings.add(bytes_written=st.st_size, files_touched=1)
+            os.replace(tmp_path, download_path)
+        self.package_not_modified = unchanged
 
-            # 若 HEAD 沒拿到 size，改用 GET 標頭
-            if total_size == 0:
-                total_size = int(response.headers.get('content-length', 0) or 0)
+        with self.timings.span('validate'):
+            valid = self._validate_download(download_path)
+        if not valid:
+            logger.error("本機資料夾中的檔案驗證失敗")
+            return None
+        self._touch_cache_entry(download_path.name)
+        return download_path
 
-            # 嘗試用 GET 回應的 headers 判斷檔名（覆寫先前推測）
-            filename_from_get = self._extract_filename_from_headers(response.headers, response.url)
-            if filename_from_get and filename_from_get != filename:
-                download_path = self.download_dir / filename_from_get
-                filename = filename_from_get
+    def delta_update(self) -> bool:
+        """增量更新：只以 Range 請求下載遠端 zip 中與已安裝版本不同的成員並安裝
 
-            downloaded_size = 0
+        無安裝記錄、伺服器不支援 Range 或遠端檔案不是 zip 時回傳 False，由呼叫端改為完整下載。
+        """
+        if not self._load_install_manifest().get('files'):
+            logger.info("尚未安裝過翻譯，無法使用增量更新")
+            return False
 
-            with open(download_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                        if total_size > 0:
-                            percentage = (downloaded_size / total_size) * 100
-                            logger.debug(f"下載進度: {percentage:.1f}%")
+        import requests
 
-            logger.info(f"下載完成: {download_path} ({downloaded_size} bytes)")
-            
-            # 驗證下載的檔案
-            if not self._validate_download(download_path):
+        try:
+            download_url = self._resolve_download_url()
+            remote = RemoteZipSource(self.session, download_url, self.download_timeout)
+        except (RemoteZipError, requests.RequestException, zipfile.BadZipFile) as e:
+            logger.info(f"無法使用增量更新: {str(e)}")
+            return False
+
+        filename = (
+            self._extract_filename_from_headers(remote.headers, remote.url)
+            or self.translation_filename
+        )
+        logger.info(f"增量更新: {filename} ({remote.size} bytes)")
+
+        # 下載目錄中沒有這個版本的完整翻譯檔，以遠端的 ETag 與 Last-Modified 識別
+        package = {
+            'etag': remote.headers.get('etag'),
+            'last_modified': remote.headers.get('last-modified'),
+            'size': remote.size,
+        }
+        installed = self._install_staged(
+            filename,
+            lambda old_files, stats: self._stage_from_zip(remote.open_zip, old_files, stats),
+            package,
+        )
+        self.timings.add(bytes_transferred=remote.bytes_fetched)
+        if not installed:
+            return False
+
+        # 記錄遠端檔案的驗證資訊：下次以條件式請求確認是否變更，也讓 is_up_to_date 能判斷已是最新版本。
+        # 下載目錄中沒有這個版本的完整翻譯檔，以 delta 標記
+        self._save_download_validators(download_url, {
+            'etag': package['etag'],
+            'last_modified': package['last_modified'],
+            'total_size': remote.size,
+            'final_url': remote.url,
+            'filename': filename,
+            'delta': True,
+        })
+
+        logger.info(
+            f"增量更新完成: 下載 {remote.bytes_fetched} bytes（{remote.requests} 個請求），"
+            f"完整檔案為 {remote.size} bytes"
+        )
+        return True
+
+    def download_translation(self, need_package: bool = False) -> Path | None:
+        """下載翻譯檔案
+
+        以增量更新安裝的版本在下載目錄中沒有完整的翻譯檔；伺服器回應未變更時回傳的路徑可能不存在，
+        由 is_package_installed 判斷不需重新安裝。need_package 為 True 時一定取得完整的翻譯檔。
+        """
+        import requests
+
+        try:
+            download_url = self._resolve_download_url()
+            if download_url.startswith('file:'):
+                return self._copy_local_package(download_url)
+            logger.info(f"開始下載: {download_url}")
+
+            # 檔名與大小直接取自 GET 回應，不再額外發送 HEAD 請求
+            result = self._download_resumable(download_url, need_package=need_package)
+            if not result:
+                return None
+            file_path, filename = result
+            download_path = self.download_dir / filename
+
+            # 已存在且通過驗證的檔案，不需重新下載
+            if file_path == download_path:
+                self._touch_cache_entry(filename)
+                return download_path
+
+            # 驗證通過後才移到正式檔名
+            with self.timings.span('validate'):
+                valid = self._validate_download(file_path, filename)
+            if not valid:
                 logger.error("下載的檔案驗證失敗")
+                self._discard_partial(file_path)
                 return None
+
+            os.replace(file_path, download_path)
+            meta = self._read_json_file(self._partial_paths(download_url)[1])
+            self._save_download_validators(download_url, meta)
+            self._record_verification(download_path, meta.get('sha256'))
+            self._discard_partial(file_path)
+            self._touch_cache_entry(filename)
+            logger.info(f"下載完成: {download_path}")
             
             return download_path
             
@@ -157,59 +717,627 @@ class TranslationManager:
             logger.exception(f"發生未預期的錯誤: {str(e)}")
             return None
     
-    def _parse_forum_page(self, forum_url: str) -> str | None:
-        """解析論壇頁面，提取下載連結"""
+    def prefetch_translation(self) -> Path | None:
+        """預先下載並驗證翻譯檔（不安裝），記錄為可供啟動時直接安裝的版本"""
+        if not self.download_lock.acquire(timeout=0):
+            logger.info("另一個程序正在使用下載目錄，略過本次預先下載")
+            return None
+        try:
+            download_path = self.download_translation(need_package=True)
+            if not download_path:
+                return None
+
+            st = download_path.stat()
+            record = {
+                'filename': download_path.name,
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'sha256': self._package_sha256(download_path),
+                'checked_at': time.time(),
+            }
+            self._write_json_atomic(self.staged_path, record)
+            logger.info(f"已預先下載並驗證: {download_path}")
+            self.prune_cache()
+            return download_path
+        finally:
+            self.download_lock.release()
+
+    def staged_package(self, max_age: float) -> Path | None:
+        """取得預先下載的翻譯檔；記錄超過 max_age 秒或檔案已變動時回傳 None"""
+        record = self._read_json_file(self.staged_path)
+        if not record.get('filename'):
+            return None
+        if time.time() - record.get('checked_at', 0) > max_age:
+            return None
+        staged = self.download_dir / record['filename']
+        try:
+            st = staged.stat()
+        except OSError:
+            return None
+        if st.st_size != record.get('size') or st.st_mtime_ns != record.get('mtime_ns'):
+            return None
+        return staged
+
+    def _touch_cache_entry(self, name: str) -> None:
+        """記錄下載目錄中的翻譯檔最後使用的時間"""
+        if not (self.download_dir / name).exists():
+            return
         try:
-            response = requests.get(
-                forum_url,
-                timeout=self.download_timeout,
-                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
+            index = self._read_json_file(self.cache_index_path)
+            index[name] = time.time()
+            self._write_json_atomic(self.cache_index_path, index)
+        except OSError as e:
+            logger.warning(f"無法更新快取記錄: {str(e)}")
+
+    def _cache_entries(self) -> list[dict]:
+        """列出下載目錄中的快取項目
+
+        每個翻譯檔連同它的驗證記錄與舊版解壓目錄算作一個版本；未完成的 .part 下載另外列出。
+        目前安裝、可還原與預先下載完成的版本標記為保留，不會被淘汰。
+        """
+        internal = {
+            self.forum_cache_path.name, self.validators_path.name, self.staged_path.name,
+            self.cache_index_path.name, self.download_lock.path.name,
+            self.staging_dir.name, self.rollback_dir.name, self.source_latency_path.name,
+            self.gameinfo_state_path.name,
+        }
+        protected = {
+            self._load_install_manifest().get('source'): "目前安裝",
+            self._read_json_file(self.rollback_dir / "rollback.json").get('manifest', {}).get('source'): "可還原",
+            self._read_json_file(self.staged_path).get('filename'): "預先下載",
+        }
+        index = self._read_json_file(self.cache_index_path)
+
+        entries = {}
+        if not self.download_dir.is_dir():
+            return []
+        for path in self.download_dir.iterdir():
+            name = path.name
+            if name in internal or name.endswith('.tmp'):
+                continue
+            if name.endswith('.verified.json'):
+                key, kind = name[:-len('.verified.json')], 'package'
+            elif name.endswith('.part') or name.endswith('.part.json'):
+                key, kind = name.removesuffix('.json'), 'partial'
+            elif path.is_dir() and (self.download_dir / f"{name}.zip").is_file():
+                # 舊版解壓到 downloads/<檔名> 的目錄，與 zip 算作同一個版本
+                key, kind = f"{name}.zip", 'package'
+            else:
+                key, kind = name, 'package'
+            entry = entries.setdefault(key, {'name': key, 'kind': kind, 'paths': [], 'size': 0, 'last_used': 0.0})
+            entry['paths'].append(path)
+            entry['size'] += self._path_size(path)
+            entry['last_used'] = max(entry['last_used'], path.stat().st_mtime)
+
+        for entry in entries.values():
+            entry['last_used'] = index.get(entry['name'], entry['last_used'])
+            entry['keep'] = protected.get(entry['name'])
+        return sorted(entries.values(), key=lambda e: e['last_used'])
+
+    def _path_size(self, path: Path) -> int:
+        """檔案或整個目錄的大小"""
+        try:
+            if not path.is_dir():
+                return path.stat().st_size
+            return sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+        except OSError:
+            return 0
+
+    def prune_cache(self) -> int:
+        """依最近最少使用的順序淘汰下載目錄中的舊版本，回傳釋放的位元組數
+
+        超過 --cache_max_versions 個版本或 --cache_max_bytes 大小時淘汰；
+        未完成的 .part 下載只在超過大小上限時淘汰。設為 0 表示不限制。
+        """
+        try:
+            entries = self._cache_entries()
+            total = sum(e['size'] for e in entries) + self._path_size(self.rollback_dir)
+            versions = sum(1 for e in entries if e['kind'] == 'package')
+            max_bytes = self.cache_max_bytes or float('inf')
+            max_versions = self.cache_max_versions or float('inf')
+
+            freed = 0
+            evicted = []
+            for entry in entries:
+                over_bytes = total > max_bytes
+                over_versions = versions > max_versions and entry['kind'] == 'package'
+                if entry['keep'] or not (over_bytes or over_versions):
+                    continue
+                for path in entry['paths']:
+                    if path.is_dir():
+                        shutil.rmtree(path, ignore_errors=True)
+                    else:
+                        path.unlink(missing_ok=True)
+                total -= entry['size']
+                freed += entry['size']
+                if entry['kind'] == 'package':
+                    versions -= 1
+                evicted.append(entry['name'])
+
+            if evicted:
+                index = self._read_json_file(self.cache_index_path)
+                for name in evicted:
+                    index.pop(name, None)
+                self._write_json_atomic(self.cache_index_path, index)
+                logger.info(f"清除 {len(evicted)} 個舊的快取項目，釋放 {freed} bytes: {', '.join(evicted)}")
+            return freed
+
+        except Exception as e:
+            logger.warning(f"清理下載快取失敗: {str(e)}")
+            return 0
+
+    def cache_stats(self) -> bool:
+        """列出下載目錄中的快取項目與大小"""
+        try:
+            entries = self._cache_entries()
+            rollback_size = self._path_size(self.rollback_dir)
+            staging_size = self._path_size(self.staging_dir)
+            logger.info(f"下載目錄: {self.download_dir}")
+            for entry in reversed(entries):
+                last_used = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['last_used']))
+                status = entry['keep'] or ("未完成下載" if entry['kind'] == 'partial' else "可清除")
+                logger.info(f"  {entry['name']}  {entry['size']} bytes  最後使用 {last_used}  [{status}]")
+            if rollback_size:
+                logger.info(f"  （還原備份 {rollback_size} bytes）")
+            if staging_size:
+                logger.info(f"  （安裝暫存區 {staging_size} bytes）")
+
+            total = sum(e['size'] for e in entries) + rollback_size + staging_size
+            versions = sum(1 for e in entries if e['kind'] == 'package')
+            logger.info(
+                f"共 {versions} 個版本，{total} bytes"
+                f"（上限 {self.cache_max_versions or '不限'} 個版本，{self.cache_max_bytes or '不限'} bytes）"
             )
-            response.encoding = 'utf-8'
-            response.raise_for_status()
-            
-            # 使用 BeautifulSoup 解析 HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 尋找 Google Drive 連結
-            # 模式 1: 直接的連結標籤
-            for link in soup.find_all('a', href=True):
-                href = link.get('href', '')
-                # 直接包含 Google Drive 的連結
-                if 'drive.google.com' in href or 'docs.google.com' in href:
-                    logger.info(f"找到 Google Drive 連結: {href}")
-                    return href
-
-                # 處理 Gamer 轉向 (ref.gamer.com.tw/redir.php?url=ENCODED_URL)
+            return True
+        except Exception as e:
+            logger.error(f"讀取快取資訊失敗: {str(e)}")
+            return False
+
+    def served_package(self) -> dict | None:
+        """目前預先下載並驗證完成的翻譯檔資訊，供 --serve 提供給其他電腦"""
+        path = self.staged_package(float('inf'))
+        if not path:
+            return None
+        record = self._read_json_file(self.staged_path)
+        sha256 = self._read_json_file(self._verification_path(path)).get('sha256')
+        if not sha256 or not self._is_verified(path):
+            return None
+        return {
+            'path': path,
+            'filename': path.name,
+            'size': record['size'],
+            'mtime': record['mtime_ns'] / 1e9,
+            'sha256': sha256,
+            'checked_at': record.get('checked_at'),
+        }
+
+    def _partial_paths(self, download_url: str) -> tuple[Path, Path]:
+        """依下載 URL 取得 .part 暫存檔與其中繼資料檔的路徑"""
+        key = hashlib.sha1(download_url.encode('utf-8')).hexdigest()[:16]
+        part_path = self.download_dir / f"download_{key}.part"
+        return part_path, part_path.with_name(part_path.name + '.json')
+
+    def _read_json_file(self, path: Path) -> dict:
+        """讀取 JSON 檔案，不存在或格式錯誤時回傳空字典"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    def _write_json_atomic(self, path: Path, data: dict) -> None:
+        """寫入 JSON 檔案：先寫暫存檔再以 os.replace 取代，中途中止也不會留下不完整的檔案"""
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+
+    def _load_download_validators(self) -> dict:
+        """讀取各下載網址上次下載時的驗證資訊（ETag、Last-Modified 等）"""
+        return self._read_json_file(self.validators_path)
+
+    def _save_download_validators(self, download_url: str, meta: dict) -> None:
+        """保存下載網址的驗證資訊，供下次發送條件式請求"""
+        validators = self._load_download_validators()
+        validators[download_url] = {
+            'etag': meta.get('etag'),
+            'last_modified': meta.get('last_modified'),
+            'content_length': meta.get('total_size'),
+            'final_url': meta.get('final_url'),
+            'filename': meta.get('filename'),
+            'delta': meta.get('delta', False),
+        }
+        self._write_json_atomic(self.validators_path, validators)
+
+    def _conditional_headers(self, download_url: str, need_package: bool = False) -> dict:
+        """依上次下載的驗證資訊產生 If-None-Match / If-Modified-Since 標頭"""
+        record = self._load_download_validators().get(download_url)
+        if not record or not record.get('filename'):
+            return {}
+
+        # 上次下載的檔案已不存在或大小不符，必須完整下載
+        local_path = self.download_dir / record['filename']
+        if not local_path.exists():
+            # 以增量更新安裝的版本：仍是目前安裝的版本時可確認伺服器上是否變更，不需完整下載
+            if need_package or not self._is_delta_installed(record):
+                return {}
+        elif record.get('content_length') and local_path.stat().st_size != record['content_length']:
+            return {}
+
+        headers = {}
+        if record.get('etag'):
+            headers['If-None-Match'] = record['etag']
+        if record.get('last_modified'):
+            headers['If-Modified-Since'] = record['last_modified']
+        return headers
+
+    def _is_delta_installed(self, record: dict) -> bool:
+        """下載驗證資訊是否對應以增量更新安裝、下載目錄中沒有完整翻譯檔的目前版本"""
+        if not record.get('delta') or not record.get('filename'):
+            return False
+        if not self._is_remote_package(self._load_install_manifest().get('package') or {}, record):
+            return False
+        local_path = self.download_dir / record['filename']
+        return not local_path.is_file() or local_path.stat().st_size != record.get('content_length')
+
+    def _discard_partial(self, part_path: Path) -> None:
+        """刪除 .part 暫存檔與中繼資料"""
+        part_path.unlink(missing_ok=True)
+        part_path.with_name(part_path.name + '.json').unlink(missing_ok=True)
+
+    def _download_resumable(self, download_url: str, request_url: str | None = None,
+                            hops: int = 0, need_package: bool = False) -> tuple[Path, str] | None:
+        """下載到 .part 暫存檔，若有上次中斷的暫存檔則以 Range 請求續傳
+
+        回傳 (檔案路徑, 檔名)；若同名檔案已存在且通過驗證，回傳的是該檔案本身。
+        下載中斷時保留暫存檔供下次續傳。request_url 為實際請求的網址
+        （跟隨 Google Drive 確認頁面時與 download_url 不同，暫存檔與驗證資訊仍以 download_url 記錄）。
+        """
+        import requests
+
+        part_path, meta_path = self._partial_paths(download_url)
+        headers = {}
+
+        # 讀取上次中斷時保存的資訊
+        meta = self._read_json_file(meta_path)
+
+        resume_from = 0
+        # 分段下載或預先配置的暫存檔已是完整大小，無法以檔案大小判斷進度，不續傳
+        if (part_path.exists() and meta.get('url') == download_url
+                and not meta.get('segmented') and not meta.get('preallocated')):
+            resume_from = part_path.stat().st_size
+        if resume_from > 0:
+            headers['Range'] = f'bytes={resume_from}-'
+            # 伺服器上的檔案若已變更，If-Range 會讓伺服器改回傳完整內容
+            validator = meta.get('etag') or meta.get('last_modified')
+            if validator:
+                headers['If-Range'] = validator
+            logger.info(f"發現未完成的下載，嘗試從 {resume_from} bytes 續傳")
+        else:
+            # 帶上次下載的驗證資訊發送條件式請求，未變更時伺服器只回 304
+            headers.update(self._conditional_headers(download_url, need_package))
+
+        response = self.session.get(
+            request_url or download_url,
+            timeout=self.download_timeout,
+            stream=True,
+            headers=headers,
+            allow_redirects=True
+        )
+
+        # 伺服器上的檔案與上次下載相同
+        if response.status_code == 304:
+            response.close()
+            self.not_modified_validators = self._load_download_validators()[download_url]
+            filename = self.not_modified_validators['filename']
+            logger.info(f"伺服器回應檔案未變更 (304)，沿用: {filename}")
+            download_path = self.download_dir / filename
+            if not download_path.exists() and not self.is_package_installed(download_path):
+                # 以增量更新安裝的檔案被改動，下載目錄中又沒有完整的翻譯檔可重新安裝
+                logger.info("下載目錄中沒有這個版本的翻譯檔，重新完整下載")
+                return self._download_resumable(download_url, request_url, hops, need_package=True)
+            self.package_not_modified = True
+            return download_path, filename
+
+        # 暫存檔已是完整內容
+        if response.status_code == 416 and resume_from > 0:
+            response.close()
+            total = self._parse_content_range_total(response.headers.get('content-range', ''))
+            if total == resume_from and meta.get('filename'):
+                logger.info("未完成的下載實際上已完整")
+                return part_path, meta['filename']
+            logger.warning("續傳範圍無效，重新下載")
+            self._discard_partial(part_path)
+            return self._download_resumable(download_url, need_package=need_package)
+
+        response.raise_for_status()
+
+        if response.status_code == 206 and resume_from > 0:
+            mode = 'ab'
+            total_size = self._parse_content_range_total(response.headers.get('content-range', ''))
+        else:
+            if resume_from > 0:
+                logger.info("伺服器不支援續傳或檔案已變更，重新下載")
+            resume_from = 0
+            mode = 'wb'
+            total_size = int(response.headers.get('content-length', 0) or 0)
+
+        # 先讀取開頭幾 KB 判斷內容：Google Drive 的大檔案會先回傳病毒掃描確認頁面，
+        # 此時直接跟隨頁面中的確認連結，不把頁面寫成翻譯檔
+        prefix = b''
+        if mode == 'wb':
+            prefix = response.raw.read(SNIFF_SIZE, decode_content=True)
+            if looks_like_html(prefix, response.headers.get('content-type', '')):
+                page = prefix + response.raw.read(CONFIRM_PAGE_MAX_SIZE - len(prefix), decode_content=True)
+                response.close()
+                confirm_url = find_drive_confirm_url(
+                    page.decode(response.encoding or 'utf-8', errors='replace'),
+                    response.url,
+                    response.cookies.get_dict(),
+                )
+                if not confirm_url or hops >= CONFIRM_MAX_HOPS:
+                    logger.error(f"下載網址回傳的是 HTML 頁面而不是翻譯檔: {response.url}")
+                    return None
+                logger.info(f"略過 Google Drive 下載確認頁面，改為請求: {confirm_url}")
+                return self._download_resumable(download_url, confirm_url, hops + 1, need_package)
+        read = _prefixed_reader(prefix, lambda n: response.raw.read(n, decode_content=True))
+
+        # 從 GET 回應的 headers 判斷檔名，再回退到 URL 或預設檔名
+        filename = (
+            self._extract_filename_from_headers(response.headers, response.url)
+            or Path(urlparse(download_url).path).name
+            or self.translation_filename
+        )
+
+        # 先保存續傳所需的資訊，下載中斷時才能接續
+        meta = {
+            'url': download_url,
+            'final_url': response.url,
+            'filename': filename,
+            'etag': response.headers.get('etag') or (meta.get('etag') if mode == 'ab' else None),
+            'last_modified': response.headers.get('last-modified') or (meta.get('last_modified') if mode == 'ab' else None),
+            'total_size': total_size,
+        }
+
+        # 伺服器支援 Range 且檔案夠大時，改用多條連線分段下載
+        segmented = (
+            self.download_connections > 1
+            and response.status_code == 200
+            and total_size >= 2 * SEGMENT_MIN_SIZE
+            and response.headers.get('accept-ranges', '').lower() == 'bytes'
+        )
+        meta['segmented'] = segmented
+        # 已知大小的新下載預先配置完整檔案；中斷時截回實際下載的長度，
+        # 程式被強制結束而未截斷時，下次不續傳
+        preallocate = not segmented and mode == 'wb' and total_size > 0
+        meta['preallocated'] = preallocate
+
+        # 沒有可用的驗證資訊時，以同名且大小相符、通過驗證的既有檔案視為最新版本
+        # （送出條件式請求後仍回應 200，代表伺服器上的檔案已更新，不能沿用同名檔案）
+        download_path = self.download_dir / filename
+        if (response.status_code == 200 and 'If-None-Match' not in headers
+                and 'If-Modified-Since' not in headers and download_path.exists()
+                and (total_size == 0 or download_path.stat().st_size == total_size)):
+            logger.info(f"發現已存在的下載檔案: {download_path}，準備驗證...")
+            with self.timings.span('validate'):
+                valid = self._validate_download(download_path)
+            if valid:
+                response.close()
+                self._discard_partial(part_path)
+                self._save_download_validators(download_url, meta)
+                logger.info(f"檔案驗證成功，跳過下載: {download_path}")
+                return download_path, filename
+            logger.warning(f"已存在檔案驗證失敗，將重新下載: {download_path}")
+
+        self._write_json_atomic(meta_path, meta)
+
+        if segmented:
+            downloaded_size = self._download_segmented(response, read, part_path, total_size, meta.get('etag'))
+            logger.info(f"下載完成: {part_path} ({downloaded_size} bytes)")
+            return part_path, filename
+
+        if self.download_connections > 1:
+            logger.info("伺服器不支援分段下載，改用單一連線")
+
+        # 下載的同時計算 SHA-256；續傳時先補算已下載的部分
+        sha = hashlib.sha256()
+        if resume_from > 0:
+            with open(part_path, 'rb') as f:
+                while chunk := f.read(COPY_BUFFER_SIZE):
+                    sha.update(chunk)
+
+        import urllib3
+
+        downloaded_size = resume_from
+        self.timings.add(files_touched=1)
+        try:
+            with open(part_path, mode) as f:
                 try:
-                    parsed_href = urlparse(href)
-                    # 檢查是否為轉址路徑或主機
-                    if 'redir.php' in parsed_href.path or 'ref.gamer.com.tw' in parsed_href.netloc:
-                        qs = parse_qs(parsed_href.query)
-                        if 'url' in qs and qs['url']:
-                            decoded = unquote(qs['url'][0])
-                            if 'drive.google.com' in decoded or 'docs.google.com' in decoded:
-                                logger.info(f"從轉址連結解析到 Google Drive: {decoded}")
-                                return decoded
-                except Exception:
-                    # 忽略解析錯誤，繼續搜尋其他連結
-                    pass
-            
-            # 模式 2: 文本中的 URL
-            text_content = soup.get_text()
-            gdrive_pattern = r'https://drive\.google\.com/[^\s<>"{}|\\^`\[\]]+'
-            matches = re.findall(gdrive_pattern, text_content)
-            if matches:
-                logger.info(f"從文本中找到 Google Drive 連結: {matches[0]}")
-                return matches[0]
-            
-            logger.warning("無法從論壇頁面找到 Google Drive 連結")
+                    if preallocate:
+                        f.truncate(total_size)
+                    downloaded_size = stream_to_file(
+                        read, f, sha, resume_from, total_size, self._log_download_progress,
+                    )
+                finally:
+                    # 寫入位置即為實際下載的長度，截斷後暫存檔即可續傳
+                    downloaded_size = f.tell()
+                    if preallocate:
+                        f.truncate(downloaded_size)
+                        meta['preallocated'] = False
+                        self._write_json_atomic(meta_path, meta)
+        except urllib3.exceptions.HTTPError as e:
+            logger.warning(f"下載中斷，已保存 {downloaded_size} bytes，下次執行將續傳")
+            raise requests.ConnectionError(str(e)) from e
+        except (requests.RequestException, OSError):
+            logger.warning(f"下載中斷，已保存 {downloaded_size} bytes，下次執行將續傳")
+            raise
+        finally:
+            response.close()
+            received = downloaded_size - resume_from
+            self.timings.add(bytes_transferred=received, bytes_written=received)
+
+        if total_size > 0 and downloaded_size != total_size:
+            logger.error(f"下載不完整: {downloaded_size}/{total_size} bytes，下次執行將續傳")
             return None
-            
+
+        meta['sha256'] = sha.hexdigest()
+        self._write_json_atomic(meta_path, meta)
+
+        logger.info(f"下載完成: {part_path} ({downloaded_size} bytes)")
+        return part_path, filename
+
+    def _log_download_progress(self, downloaded: int, total_size: int, rate: float, eta: float | None) -> None:
+        """記錄下載進度、速度與預估剩餘時間"""
+        speed = f"{rate / 1024 / 1024:.1f} MB/s"
+        if total_size > 0 and eta is not None:
+            logger.info(f"下載進度: {downloaded / total_size * 100:.1f}% ({speed}，剩餘約 {eta:.0f} 秒)")
+        else:
+            logger.info(f"已下載 {downloaded} bytes ({speed})")
+
+    def _download_segmented(self, response, read_first, part_path: Path, total_size: int, etag: str | None) -> int:
+        """以多條連線同時下載各個位元組範圍，寫入預先配置大小的暫存檔
+
+        第一段以 read_first(n) 讀取已開啟的回應（包含判斷內容時已讀取的開頭），
+        其餘各段以 Range 請求下載。回傳下載的位元組數。
+        """
+        connections = max(1, min(self.download_connections, total_size // SEGMENT_MIN_SIZE))
+        segment_size = -(-total_size // connections)
+        ranges = [(start, min(start + segment_size, total_size) - 1) for start in range(0, total_size, segment_size)]
+        # 使用轉址後的最終網址，避免每段都重新經過轉址
+        segment_url = response.url
+        logger.info(f"分段下載: {len(ranges)} 條連線，每段約 {segment_size} bytes")
+
+        # 預先配置完整檔案大小，各段直接寫入對應位置
+        with open(part_path, 'wb') as f:
+            f.truncate(total_size)
+        # 各段在工作執行緒中下載，統計數字直接累加到目前的區段
+        span = self.timings.current()
+        if span:
+            span.add(files_touched=1)
+
+        def fetch(index: int, start: int, end: int) -> int:
+            if index == 0:
+                resp = response
+            else:
+                headers = {'Range': f'bytes={start}-{end}'}
+                if etag:
+                    headers['If-Range'] = etag
+                resp = self.session.get(segment_url, timeout=self.download_timeout, stream=True, headers=headers)
+                if resp.status_code != 206:
+                    resp.close()
+                    raise IOError(f"分段 {index} 未取得部分內容回應 (HTTP {resp.status_code})")
+
+            remaining = end - start + 1
+            if index == 0:
+                chunks = iter(lambda: read_first(SEGMENT_CHUNK_SIZE), b'')
+            else:
+                chunks = resp.iter_content(chunk_size=SEGMENT_CHUNK_SIZE)
+            try:
+                with open(part_path, 'r+b') as f:
+                    f.seek(start)
+                    for chunk in chunks:
+                        if not chunk:
+                            continue
+                        # 第一段沿用完整回應，讀到本段結尾即停止
+                        chunk = chunk[:remaining]
+                        f.write(chunk)
+                        remaining -= len(chunk)
+                        if remaining <= 0:
+                            break
+            finally:
+                resp.close()
+                if span:
+                    received = end - start + 1 - remaining
+                    span.add(bytes_transferred=received, bytes_written=received)
+
+            if remaining > 0:
+                raise IOError(f"分段 {index} 下載不完整，缺少 {remaining} bytes")
+            logger.debug(f"分段 {index} 完成: bytes {start}-{end}")
+            return end - start + 1
+
+        with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix='download') as executor:
+            futures = [executor.submit(fetch, index, start, end) for index, (start, end) in enumerate(ranges)]
+            try:
+                return sum(future.result() for future in futures)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                logger.warning("分段下載失敗，下次執行將重新下載")
+                raise
+
+    def _parse_content_range_total(self, content_range: str) -> int:
+        """從 Content-Range 標頭（bytes 0-99/1234）取得檔案總大小，未知時回傳 0"""
+        m = re.search(r'/(\d+)\s*$', content_range or '')
+        return int(m.group(1)) if m else 0
+
+    def _resolve_forum_link(self, forum_url: str, cancelled: threading.Event | None = None) -> str | None:
+        """取得論壇頁面中的下載連結，TTL 內直接使用快取，過期時以條件式請求確認頁面是否變更
+
+        cancelled 設定後停止讀取頁面並回傳 None，不更新快取。
+        """
+        cache = self._read_json_file(self.forum_cache_path)
+        entry = cache.get(forum_url) if not self.refresh else None
+
+        if entry and entry.get('link'):
+            age = time.time() - entry.get('resolved_at', 0)
+            if 0 <= age < self.forum_cache_ttl:
+                logger.info(f"使用快取的下載連結（{age:.0f} 秒前解析）: {entry['link']}")
+                return entry['link']
+
+        headers = {}
+        if entry and entry.get('link'):
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = self.session.get(forum_url, timeout=self.download_timeout, headers=headers, stream=True)
+            if response.status_code == 304:
+                response.close()
+                logger.info("論壇頁面未變更，沿用快取的下載連結")
+                link = entry['link']
+            else:
+                response.encoding = 'utf-8'
+                response.raise_for_status()
+                link = self._read_download_link(response, cancelled)
         except Exception as e:
             logger.error(f"解析論壇頁面失敗: {str(e)}")
             return None
-    
+
+        if cancelled is not None and cancelled.is_set():
+            return None
+        if link:
+            cache[forum_url] = {
+                'link': link,
+                'resolved_at': time.time(),
+                'etag': response.headers.get('etag') or (entry or {}).get('etag'),
+                'last_modified': response.headers.get('last-modified') or (entry or {}).get('last_modified'),
+            }
+            try:
+                self._write_json_atomic(self.forum_cache_path, cache)
+            except OSError as e:
+                logger.warning(f"無法寫入下載連結快取: {str(e)}")
+        return link
+
+    def _read_download_link(self, response, cancelled: threading.Event | None = None) -> str | None:
+        """串流讀取論壇頁面並擷取下載連結，找到後或 cancelled 設定後立即停止下載頁面其餘內容"""
+        def counted(chunks):
+            for chunk in chunks:
+                if cancelled is not None and cancelled.is_set():
+                    return
+                self.timings.add(bytes_transferred=len(chunk))
+                yield chunk
+
+        try:
+            return stream_extract_download_link(
+                counted(response.iter_content(chunk_size=FORUM_CHUNK_SIZE)),
+                response.encoding or 'utf-8',
+            )
+        finally:
+            response.close()
+
     def _convert_gdrive_url(self, gdrive_url: str) -> str:
         """轉換 Google Drive 連結為直接下載 URL"""
         try:
@@ -250,28 +1378,67 @@ class TranslationManager:
             logger.error(f"轉換 Google Drive 連結失敗: {str(e)}")
             return gdrive_url
     
-    def _validate_download(self, file_path: Path) -> bool:
-        """驗證下載的檔案"""
+    def _validate_download(self, file_path: Path, filename: str | None = None) -> bool:
+        """驗證下載的檔案（filename 為檔案的正式名稱，用於 .part 暫存檔的類型判斷）
+
+        已驗證過且大小、修改時間都未變的檔案只比對驗證記錄，
+        完整的 CRC 檢查只在新檔案、檔案變動或使用 --verify full 時進行。
+        """
         try:
             # 檢查檔案存在
             if not file_path.exists():
                 logger.error("下載的檔案不存在")
                 return False
+
+            # 驗證記錄與檔案狀態一致，不需重新檢查
+            if filename is None and self.verify_mode != 'full' and self._is_verified(file_path):
+                logger.info("檔案與上次驗證時相同，略過完整性檢查")
+                return True
             
             # 如果是 zip 檔案，驗證完整性
-            if file_path.suffix.lower() == '.zip':
+            if Path(filename or file_path.name).suffix.lower() == '.zip':
                 with zipfile.ZipFile(file_path, 'r') as zip_file:
                     if zip_file.testzip() is not None:
                         logger.error("Zip 檔案損壞")
                         return False
             
             logger.info("檔案驗證成功")
+
+            # .part 暫存檔在改名後才記錄，已在正式位置的檔案直接記錄
+            if filename is None:
+                self._record_verification(file_path)
             return True
             
         except Exception as e:
             logger.error(f"驗證失敗: {str(e)}")
             return False
 
+    def _verification_path(self, file_path: Path) -> Path:
+        """驗證記錄檔的路徑"""
+        return file_path.with_name(file_path.name + '.verified.json')
+
+    def _record_verification(self, file_path: Path, sha256: str | None = None) -> None:
+        """記錄已通過驗證的檔案的大小、修改時間與 SHA-256"""
+        try:
+            if not sha256:
+                sha256 = self._hash_file(file_path)[0]
+            st = file_path.stat()
+            record = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': sha256}
+            self._write_json_atomic(self._verification_path(file_path), record)
+        except OSError as e:
+            logger.warning(f"無法寫入驗證記錄: {str(e)}")
+
+    def _is_verified(self, file_path: Path) -> bool:
+        """檔案的大小與修改時間是否與驗證記錄相同"""
+        record = self._read_json_file(self._verification_path(file_path))
+        if not record:
+            return False
+        try:
+            st = file_path.stat()
+        except OSError:
+            return False
+        return st.st_size == record.get('size') and st.st_mtime_ns == record.get('mtime_ns')
+
     def _extract_filename_from_headers(self, headers: dict, url: str) -> str | None:
         """從 HTTP 回應標頭或 URL 推斷檔名"""
         try:
@@ -421,85 +1588,698 @@ class TranslationManager:
             return s
     
     def replace_translation_files(self, source_path: Path) -> bool:
-        """替換翻譯檔案"""
+        """替換翻譯檔案（僅寫入新增或內容有變更的檔案）"""
+        logger.info(f"開始替換檔案: {source_path}")
+
+        # zip 檔案直接從壓縮檔串流寫入暫存區，不再先解壓到下載目錄
+        if source_path.suffix.lower() == '.zip':
+            # 舊版會先解壓到 downloads/<檔名>，這份重複的檔案已不再需要
+            stale_extract_dir = self.download_dir / source_path.stem
+            if stale_extract_dir.is_dir():
+                logger.info(f"移除舊的解壓目錄: {stale_extract_dir}")
+                shutil.rmtree(stale_extract_dir, ignore_errors=True)
+
+            open_zip = lambda: zipfile.ZipFile(source_path, 'r')
+            stage = lambda old_files, stats: self._stage_from_zip(open_zip, old_files, stats)
+            package = {'sha256': self._package_sha256(source_path), 'size': source_path.stat().st_size}
+        elif source_path.is_dir():
+            stage = lambda old_files, stats: self._stage_from_dir(source_path, old_files, stats)
+            package = None
+        else:
+            # 例如沒有 Content-Disposition、檔名取自網址的鏡像回傳了其他格式的檔案
+            logger.error(f"不支援的翻譯檔格式（只支援 zip 檔案或資料夾）: {source_path.name}")
+            return False
+
+        return self._install_staged(source_path.name, stage, package)
+
+    def _install_staged(self, source_name: str, stage, package: dict | None = None) -> bool:
+        """以 stage(old_files, stats) 準備暫存檔後換入遊戲目錄並更新安裝清單
+
+        新檔案先全部放到 downloads/staging，再一次以 os.replace 換入遊戲目錄；
+        被取代或移除的原檔案移到 downloads/rollback，可用 rollback_translation 還原。
+        package 為翻譯檔的識別資訊（見 _save_install_manifest），記錄在安裝清單中。
+        """
         try:
-            logger.info(f"開始替換檔案: {source_path}")
-            
-            # 如果是 zip 檔案，先解壓到下載目錄
-            if source_path.suffix.lower() == '.zip':
-                extract_dir = self.download_dir / source_path.stem
-                logger.info(f"解壓檔案到下載目錄: {extract_dir}")
-                extract_dir.mkdir(parents=True, exist_ok=True)
-                with zipfile.ZipFile(source_path, 'r') as zip_file:
-                    zip_file.extractall(extract_dir)
-            else:
-                extract_dir = source_path
-            
-            # 替換翻譯檔案
-            # 這裡需要根據實際的檔案結構調整
-            translation_dir = extract_dir
-            
-            # 搜尋並複製翻譯檔案
-            for src_file in translation_dir.rglob('*'):
-                if src_file.is_file():
-                    # 根據檔案路徑決定目標位置
-                    # 預設: 直接複製到遊戲目錄對應位置
-                    relative_path = src_file.relative_to(translation_dir)
-                    dest_file = self.deadlock_path / relative_path
-                    
-                    # 建立目標目錄
-                    dest_file.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # 複製檔案
-                    shutil.copy2(src_file, dest_file)
-                    logger.debug(f"已複製: {src_file} -> {dest_file}")
+            self._check_install_cancelled()
+
+            # 讀取上次安裝的清單，用來判斷哪些檔案不需要重新寫入
+            old_manifest = self._load_install_manifest()
+            old_files = old_manifest.get('files', {})
+            stats = {'written': 0, 'skipped': 0, 'bytes_written': 0, 'bytes_skipped': 0}
+
+            # 清除上次中斷時留下的暫存檔
+            shutil.rmtree(self.staging_dir, ignore_errors=True)
+            try:
+                with self.timings.span('stage'):
+                    new_files, staged = stage(old_files, stats)
+                    self.timings.add(bytes_written=stats['bytes_written'])
+
+                # 翻譯檔中沒有任何檔案時，所有已安裝的檔案都會被視為舊檔案而移除
+                if not new_files and not staged:
+                    logger.error("翻譯檔中沒有任何檔案，保留目前安裝的翻譯檔案")
+                    return False
+
+                # 舊版本有、新版本已不存在的檔案
+                package_paths = set(new_files) | {item[0] for item in staged}
+                removed = self._find_stale_files(old_files, package_paths)
+
+                # 換入期間不接受取消，確保遊戲目錄是完整的舊版本或新版本
+                with self._commit_lock:
+                    self._check_install_cancelled()
+                    with self.timings.span('commit') as span:
+                        self._commit_staged(staged, removed, old_manifest)
+                        span.add(files_touched=len(staged) + len(removed))
+            finally:
+                shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+            for relative_path, _, sha256, crc32 in staged:
+                new_files[relative_path] = self._make_manifest_entry(self.deadlock_path / relative_path, sha256, crc32)
+            self._save_install_manifest(new_files, source_name, package)
+            self._touch_cache_entry(source_name)
+            self.prune_cache()
             
-            logger.info("檔案替換完成")
+            logger.info(
+                f"檔案替換完成: 寫入 {stats['written']} 個檔案 ({stats['bytes_written']} bytes)，"
+                f"跳過 {stats['skipped']} 個未變更檔案 ({stats['bytes_skipped']} bytes)，"
+                f"移除 {len(removed)} 個舊檔案"
+            )
             
             return True
+
+        except InstallCancelledError:
+            logger.warning("安裝已取消，遊戲檔案未變動，將於下次啟動時安裝")
+            return False
             
         except Exception as e:
             logger.error(f"替換檔案失敗: {str(e)}")
             return False
+
+    def _stage_from_zip(self, open_zip, old_files: dict, stats: dict) -> tuple[dict, list]:
+        """將 zip 中有變更的檔案串流到暫存區（open_zip 每次呼叫開啟一個新的 ZipFile）
+
+        回傳 (未變更檔案的清單項目, 暫存檔列表 [(相對路徑, 暫存路徑, SHA-256, CRC32)])
+        """
+        new_files = {}
+        pending = []
+        with open_zip() as zip_file:
+            for info in zip_file.infolist():
+                if info.is_dir():
+                    continue
+
+                relative_path = self._safe_member_path(info.filename)
+                if not relative_path:
+                    logger.warning(f"略過不安全的壓縮檔路徑: {info.filename}")
+                    continue
+                dest_file = self.deadlock_path / relative_path
+
+                # 以 zip 目錄中的大小與 CRC32 比對清單，不需解壓即可判斷是否變更
+                entry = old_files.get(relative_path)
+                if (entry and entry.get('crc32') == info.CRC and entry.get('size') == info.file_size
+                        and self._is_dest_unchanged(entry, dest_file)):
+                    new_files[relative_path] = entry
+                    stats['skipped'] += 1
+                    stats['bytes_skipped'] += entry['size']
+                    logger.debug(f"未變更，跳過: {relative_path}")
+                    continue
+
+                pending.append((relative_path, info, self.staging_dir / relative_path))
+
+        if not pending:
+            return new_files, []
+
+        # 大檔案優先開始，避免單一大檔最後才開始而拖長總時間
+        pending.sort(key=lambda item: item[1].file_size, reverse=True)
+        workers = max(1, min(self.install_workers, len(pending)))
+        logger.info(f"需寫入 {len(pending)} 個檔案，使用 {workers} 個工作執行緒")
+
+        started = time.perf_counter()
+        results = self._extract_members(open_zip, pending, workers)
+        wall_seconds = time.perf_counter() - started
+
+        staged = []
+        file_seconds = 0.0
+        for (relative_path, info, stage_path), (sha256, elapsed) in zip(pending, results):
+            staged.append((relative_path, stage_path, sha256, info.CRC))
+            stats['written'] += 1
+            stats['bytes_written'] += info.file_size
+            file_seconds += elapsed
+
+        logger.info(f"解壓寫入耗時 {wall_seconds:.2f} 秒（各檔案累計 {file_seconds:.2f} 秒）")
+        return new_files, staged
+
+    def _extract_members(self, open_zip, pending: list, workers: int) -> list[tuple[str, float]]:
+        """以工作執行緒池解壓 zip 成員，依 pending 順序回傳 (SHA-256, 耗時秒數)"""
+        # 每個執行緒各自開啟 zip，避免共用同一個檔案指標
+        local = threading.local()
+        opened = []
+        opened_lock = threading.Lock()
+
+        def extract(item):
+            relative_path, info, stage_path = item
+            self._check_install_cancelled()
+            zip_file = getattr(local, 'zip_file', None)
+            if zip_file is None:
+                zip_file = local.zip_file = open_zip()
+                with opened_lock:
+                    opened.append(zip_file)
+            t0 = time.perf_counter()
+            sha256 = self._stage_member(zip_file, info, stage_path)
+            elapsed = time.perf_counter() - t0
+            logger.debug(f"已寫入: {relative_path} ({info.file_size} bytes, {elapsed:.3f} 秒)")
+            return sha256, elapsed
+
+        try:
+            if workers <= 1:
+                return [extract(item) for item in pending]
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='install') as executor:
+                futures = [executor.submit(extract, item) for item in pending]
+                try:
+                    return [future.result() for future in futures]
+                except BaseException:
+                    # 任一檔案失敗即取消尚未開始的工作
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            for zip_file in opened:
+                zip_file.close()
+
+    def _stage_from_dir(self, translation_dir: Path, old_files: dict, stats: dict) -> tuple[dict, list]:
+        """將資料夾中有變更的檔案放到暫存區，回傳值同 _stage_from_zip"""
+        new_files = {}
+        staged = []
+        linked = 0
+
+        # 搜尋並複製翻譯檔案
+        for src_file in translation_dir.rglob('*'):
+            if src_file.is_file():
+                # 根據檔案路徑決定目標位置
+                # 預設: 直接複製到遊戲目錄對應位置
+                relative_path = src_file.relative_to(translation_dir).as_posix()
+                dest_file = self.deadlock_path / relative_path
+
+                # 內容與上次安裝相同且遊戲目錄中的檔案未被改動，跳過
+                entry = old_files.get(relative_path)
+                if entry and self._is_install_unchanged(entry, src_file, dest_file):
+                    new_files[relative_path] = entry
+                    stats['skipped'] += 1
+                    stats['bytes_skipped'] += entry['size']
+                    logger.debug(f"未變更，跳過: {relative_path}")
+                    continue
+                
+                self._check_install_cancelled()
+
+                stage_path = self.staging_dir / relative_path
+                sha256, crc32, was_linked = self._stage_file(src_file, stage_path)
+                staged.append((relative_path, stage_path, sha256, crc32))
+                linked += was_linked
+                stats['written'] += 1
+                stats['bytes_written'] += stage_path.stat().st_size
+                logger.debug(f"已暫存: {src_file} -> {stage_path}")
+
+        if linked:
+            logger.info(f"{linked} 個檔案以連結方式安裝，未複製資料")
+        return new_files, staged
+
+    def _safe_member_path(self, name: str) -> str | None:
+        """將 zip 成員名稱正規化為相對路徑，拒絕絕對路徑與 .. 等跳出遊戲目錄的路徑"""
+        parts = [p for p in name.replace('\\', '/').split('/') if p not in ('', '.')]
+        if not parts or '..' in parts or ':' in parts[0]:
+            return None
+        return '/'.join(parts)
+
+    def _stage_member(self, zip_file: zipfile.ZipFile, info: zipfile.ZipInfo, stage_path: Path) -> str:
+        """將 zip 成員串流寫入暫存區，回傳 SHA-256"""
+        stage_path.parent.mkdir(parents=True, exist_ok=True)
+        with zip_file.open(info, 'r') as fsrc, open(stage_path, 'wb') as fdst:
+            sha256, _ = self._stream_with_hash(fsrc, fdst)
+        return sha256
+
+    def _stage_file(self, src_file: Path, stage_path: Path) -> tuple[str, int, bool]:
+        """將來源檔案放到暫存區，回傳 (SHA-256, CRC32, 是否以連結完成)
+
+        優先使用 reflink 或硬連結（不複製資料），檔案系統不支援時才複製。
+        """
+        stage_path.parent.mkdir(parents=True, exist_ok=True)
+        if self._try_reflink(src_file, stage_path) or self._try_hardlink(src_file, stage_path):
+            sha256, crc32 = self._hash_file(src_file)
+            return sha256, crc32, True
+
+        with open(src_file, 'rb') as fsrc, open(stage_path, 'wb') as fdst:
+            sha256, crc32 = self._stream_with_hash(fsrc, fdst)
+        shutil.copystat(src_file, stage_path)
+        return sha256, crc32, False
+
+    def _try_reflink(self, src_file: Path, dest_file: Path) -> bool:
+        """嘗試以 reflink（寫入時複製）建立檔案，僅支援 Linux 的 Btrfs/XFS 等檔案系統"""
+        if not sys.platform.startswith('linux'):
+            return False
+        try:
+            import fcntl
+            with open(src_file, 'rb') as fsrc, open(dest_file, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copystat(src_file, dest_file)
+            return True
+        except OSError:
+            dest_file.unlink(missing_ok=True)
+            return False
+
+    def _try_hardlink(self, src_file: Path, dest_file: Path) -> bool:
+        """嘗試建立硬連結（來源與目標須在同一磁碟區）"""
+        try:
+            os.link(src_file, dest_file)
+            return True
+        except OSError:
+            return False
+
+    def _commit_staged(self, staged: list, removed: list[str], old_manifest: dict) -> None:
+        """將暫存區的檔案一次換入遊戲目錄，被取代或移除的原檔案移到 rollback 目錄
+
+        換入途中失敗時立即還原已換入的檔案。
+        """
+        if not staged and not removed:
+            return
+
+        # 只保留前一個版本
+        shutil.rmtree(self.rollback_dir, ignore_errors=True)
+        self.rollback_dir.mkdir(parents=True, exist_ok=True)
+
+        plan = [
+            {'path': relative_path, 'backup': (self.deadlock_path / relative_path).exists()}
+            for relative_path in removed + [item[0] for item in staged]
+        ]
+        # 先寫入還原資訊，換入途中程式中止也能還原
+        self._write_json_atomic(self.rollback_dir / "rollback.json", {'manifest': old_manifest, 'files': plan})
+
+        stage_paths = {relative_path: stage_path for relative_path, stage_path, _, _ in staged}
+        done = []
+        try:
+            for entry in plan:
+                dest_file = self.deadlock_path / entry['path']
+                done.append(entry)
+                if entry['backup']:
+                    backup = self.rollback_dir / "files" / entry['path']
+                    backup.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(dest_file, backup)
+                stage_path = stage_paths.get(entry['path'])
+                if stage_path:
+                    dest_file.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(stage_path, dest_file)
+        except BaseException:
+            logger.error("換入檔案時發生錯誤，還原原本的檔案")
+            self._restore_files(done)
+            raise
+
+    def _restore_files(self, entries: list) -> None:
+        """依還原資訊把 rollback 目錄中的原檔案放回遊戲目錄，並移除新增的檔案"""
+        for entry in reversed(entries):
+            dest_file = self.deadlock_path / entry['path']
+            backup = self.rollback_dir / "files" / entry['path']
+            if entry['backup']:
+                if backup.exists():
+                    dest_file.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(backup, dest_file)
+            else:
+                dest_file.unlink(missing_ok=True)
+
+    def rollback_translation(self) -> bool:
+        """還原到最近一次安裝前的翻譯檔案"""
+        try:
+            info = self._read_json_file(self.rollback_dir / "rollback.json")
+            if not info.get('files'):
+                logger.warning("沒有可還原的版本")
+                return False
+
+            self._restore_files(info['files'])
+            old_manifest = info.get('manifest') or {}
+            if 'files' in old_manifest:
+                self._save_install_manifest(
+                    old_manifest['files'], old_manifest.get('source', ''), old_manifest.get('package')
+                )
+            else:
+                self.manifest_path.unlink(missing_ok=True)
+
+            shutil.rmtree(self.rollback_dir, ignore_errors=True)
+            logger.info(f"已還原 {len(info['files'])} 個檔案到上一個版本")
+            return True
+        except Exception as e:
+            logger.error(f"還原失敗: {str(e)}")
+            return False
+
+    def is_up_to_date(self) -> bool:
+        """不連網檢查是否可以直接啟動遊戲
+
+        論壇連結快取未過期、該連結上次下載的檔案就是目前安裝的版本、沒有待安裝的預先下載版本、
+        已安裝的檔案未被改動，且 gameinfo.gi 已啟用繁體中文時回傳 True。
+        翻譯檔每個版本都同名，版本以安裝清單記錄的 SHA-256（增量更新為 ETag 與 Last-Modified）比對。
+        """
+        try:
+            # 使用區域網路快取時由伺服器判斷是否有新版本
+            if self.refresh or self.source:
+                return False
+
+            entry = self._read_json_file(self.forum_cache_path).get(self.forum_url) or {}
+            age = time.time() - entry.get('resolved_at', 0)
+            if not entry.get('link') or not 0 <= age < self.forum_cache_ttl:
+                return False
+            download_url = entry['link']
+            if 'drive.google.com' in download_url or 'docs.google.com' in download_url:
+                download_url = self._convert_gdrive_url(download_url)
+
+            manifest = self._load_install_manifest()
+            source = manifest.get('source')
+            package = manifest.get('package') or {}
+            record = self._load_download_validators().get(download_url, {})
+            if not source or not record.get('filename'):
+                return False
+            if record.get('delta'):
+                if not self._is_remote_package(package, record):
+                    return False
+            elif not self._is_installed_sha256(package, self.download_dir / record['filename']):
+                return False
+
+            # 預先下載的版本（即使同名）尚未安裝
+            staged = self.staged_package(float('inf'))
+            if staged:
+                staged_sha256 = self._read_json_file(self.staged_path).get('sha256')
+                if staged_sha256 and staged_sha256 != package.get('sha256'):
+                    return False
+                if not staged_sha256 and not self._is_installed_sha256(package, staged):
+                    return False
+
+            files = manifest.get('files', {})
+            damaged, refreshed = self._scan_installed(files)
+            if refreshed:
+                self._save_install_manifest(files, source, manifest.get('package'))
+            if damaged:
+                return False
+
+            return self.is_gameinfo_patched()
+
+        except Exception as e:
+            logger.debug(f"無法確認本機狀態: {str(e)}")
+            return False
+
+    def verify_installed(self) -> bool:
+        """離線檢查已安裝的翻譯檔案，被 Steam 更新覆寫或遺失的檔案從下載目錄中的翻譯檔還原"""
+        try:
+            manifest = self._load_install_manifest()
+            files = manifest.get('files', {})
+            if not files:
+                logger.warning("沒有安裝記錄，無法檢查已安裝的翻譯檔案")
+                return False
+
+            started = time.perf_counter()
+            damaged, refreshed = self._scan_installed(files)
+            logger.info(
+                f"檢查 {len(files)} 個已安裝檔案耗時 {time.perf_counter() - started:.2f} 秒"
+                f"（重新計算雜湊 {refreshed} 個）"
+            )
+            if refreshed:
+                self._save_install_manifest(files, manifest.get('source', ''), manifest.get('package'))
+
+            if not damaged:
+                logger.info("已安裝的翻譯檔案皆完整")
+                return True
+
+            logger.warning(f"{len(damaged)} 個翻譯檔案被修改或遺失，例如: {damaged[0]}")
+
+            # 以增量更新安裝的版本沒有完整的翻譯檔，改以增量更新重新下載被改動的檔案
+            if any(self._is_delta_installed(record) for record in self._load_download_validators().values()):
+                logger.info("此版本以增量更新安裝，下載目錄中沒有完整的翻譯檔，改以增量更新修復（需要連網）")
+                return self.delta_update()
+
+            # 從下載目錄中的翻譯檔還原（不需連網）
+            package = self.download_dir / manifest.get('source', '')
+            if not manifest.get('source') or not package.is_file() or not self._validate_download(package):
+                logger.error("下載目錄中沒有可用的翻譯檔，需要重新下載")
+                return False
+            return self.replace_translation_files(package)
+
+        except Exception as e:
+            logger.error(f"檢查已安裝檔案失敗: {str(e)}")
+            return False
+
+    def _scan_installed(self, files: dict) -> tuple[list[str], int]:
+        """以每個資料夾一次 os.scandir 比對安裝清單中的大小、修改時間與 inode
+
+        狀態有變的檔案才重新計算雜湊；內容未變者直接更新清單中的狀態。
+        回傳 (內容不符或遺失的檔案, 重新計算雜湊的檔案數)。
+        """
+        by_dir = {}
+        for relative_path in files:
+            parent, _, name = relative_path.rpartition('/')
+            by_dir.setdefault(parent, []).append(name)
+
+        damaged = []
+        refreshed = 0
+        for parent, names in by_dir.items():
+            directory = self.deadlock_path / parent if parent else self.deadlock_path
+            try:
+                with os.scandir(directory) as it:
+                    stats = {e.name: e.stat() for e in it if e.name in names}
+            except OSError:
+                stats = {}
+
+            for name in names:
+                relative_path = f"{parent}/{name}" if parent else name
+                entry = files[relative_path]
+                st = stats.get(name)
+                if st is None:
+                    damaged.append(relative_path)
+                    continue
+
+                # Windows 的 scandir 不提供 inode（為 0），此時只比對大小與修改時間
+                same_inode = not st.st_ino or not entry.get('inode') or st.st_ino == entry['inode']
+                if (st.st_size == entry.get('size') and st.st_mtime_ns == entry.get('mtime_ns')
+                        and same_inode and 'inode' in entry):
+                    continue
+
+                refreshed += 1
+                if st.st_size == entry.get('size') and self._hash_file(directory / name)[0] == entry.get('sha256'):
+                    entry['mtime_ns'] = st.st_mtime_ns
+                    entry['inode'] = st.st_ino
+                else:
+                    damaged.append(relative_path)
+
+        return damaged, refreshed
+
+    def is_package_installed(self, source_path: Path) -> bool:
+        """此翻譯檔是否就是上次安裝完成的版本，且已安裝的檔案都未被改動
+
+        論壇的翻譯檔每個版本都同名，因此比對安裝清單記錄的 SHA-256 而不是檔名；
+        以增量更新安裝、下載目錄中沒有完整檔案的版本，比對伺服器回應 304 時的 ETag 與 Last-Modified。
+        """
+        manifest = self._load_install_manifest()
+        package = manifest.get('package') or {}
+        if source_path.is_file():
+            if not package.get('sha256') or package['sha256'] != self._package_sha256(source_path):
+                return False
+        else:
+            record = self.not_modified_validators or {}
+            if record.get('filename') != source_path.name or not self._is_remote_package(package, record):
+                return False
+
+        # 同一版本的檔案仍可能被 Steam 更新覆寫，需重新安裝
+        files = manifest.get('files', {})
+        damaged, refreshed = self._scan_installed(files)
+        if refreshed:
+            self._save_install_manifest(files, manifest['source'], package)
+        if damaged:
+            logger.warning(f"{len(damaged)} 個翻譯檔案被修改或遺失，例如: {damaged[0]}")
+            return False
+        return True
+
+    def _load_install_manifest(self) -> dict:
+        """讀取安裝清單，不存在或格式錯誤時回傳空清單"""
+        try:
+            if not self.manifest_path.exists():
+                return {}
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != INSTALL_MANIFEST_VERSION:
+                logger.info("安裝清單版本不符，將重新安裝所有檔案")
+                return {}
+            return manifest
+        except Exception as e:
+            logger.warning(f"讀取安裝清單失敗，將重新安裝所有檔案: {str(e)}")
+            return {}
+
+    def _save_install_manifest(self, files: dict, source_name: str, package: dict | None = None) -> None:
+        """寫入安裝清單（先寫暫存檔再取代，避免留下不完整的清單）
+
+        package 識別安裝的是哪一個版本：完整翻譯檔為 {'sha256', 'size'}，
+        增量更新為遠端檔案的 {'etag', 'last_modified', 'size'}；從資料夾安裝時為 None。
+        """
+        manifest = {
+            'version': INSTALL_MANIFEST_VERSION,
+            'source': source_name,
+            'package': package,
+            'files': files,
+        }
+        self._write_json_atomic(self.manifest_path, manifest)
+
+    def _package_sha256(self, file_path: Path) -> str:
+        """翻譯檔的 SHA-256；檔案與驗證記錄一致時直接使用記錄中的值"""
+        if self._is_verified(file_path):
+            sha256 = self._read_json_file(self._verification_path(file_path)).get('sha256')
+            if sha256:
+                return sha256
+        return self._hash_file(file_path)[0]
+
+    def _is_installed_sha256(self, package: dict, file_path: Path) -> bool:
+        """下載目錄中的翻譯檔是否就是安裝清單記錄的版本（只使用驗證記錄，不重新計算雜湊）"""
+        if not package.get('sha256') or not self._is_verified(file_path):
+            return False
+        return self._read_json_file(self._verification_path(file_path)).get('sha256') == package['sha256']
+
+    def _is_remote_package(self, package: dict, record: dict) -> bool:
+        """安裝清單記錄的版本是否就是驗證資訊記錄的遠端檔案（比對 ETag 與 Last-Modified）"""
+        remote = (record.get('etag'), record.get('last_modified'))
+        return any(remote) and remote == (package.get('etag'), package.get('last_modified'))
+
+    def _make_manifest_entry(self, dest_file: Path, sha256: str, crc32: int) -> dict:
+        """依已安裝檔案的狀態建立清單項目"""
+        st = dest_file.stat()
+        return {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'inode': st.st_ino,
+            'sha256': sha256,
+            'crc32': crc32,
+        }
+
+    def _is_install_unchanged(self, entry: dict, src_file: Path, dest_file: Path) -> bool:
+        """判斷來源檔案與已安裝檔案是否都與清單記錄一致"""
+        try:
+            if not self._is_dest_unchanged(entry, dest_file):
+                return False
+
+            src_stat = src_file.stat()
+            if src_stat.st_size != entry['size']:
+                return False
+
+            # copy2 會保留修改時間，時間相同即視為同一份內容，否則比對雜湊
+            if src_stat.st_mtime_ns == entry['mtime_ns']:
+                return True
+            return self._hash_file(src_file)[0] == entry['sha256']
+        except (OSError, KeyError):
+            return False
+
+    def _is_dest_unchanged(self, entry: dict, dest_file: Path) -> bool:
+        """遊戲目錄中的檔案是否仍是上次安裝的狀態（可能被 Steam 更新覆寫）"""
+        try:
+            dest_stat = dest_file.stat()
+            return dest_stat.st_size == entry['size'] and dest_stat.st_mtime_ns == entry['mtime_ns']
+        except (OSError, KeyError):
+            return False
+
+    def _find_stale_files(self, old_files: dict, package_paths: set[str]) -> list[str]:
+        """找出新版本已不包含的檔案（只包含仍與清單記錄一致的檔案）"""
+        stale = []
+        for relative_path, entry in old_files.items():
+            if relative_path in package_paths:
+                continue
+            if self._is_dest_unchanged(entry, self.deadlock_path / relative_path):
+                stale.append(relative_path)
+        return stale
+
+    def _hash_file(self, file_path: Path) -> tuple[str, int]:
+        """計算檔案的 SHA-256 與 CRC32"""
+        sha = hashlib.sha256()
+        crc = 0
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(COPY_BUFFER_SIZE)
+                if not chunk:
+                    break
+                sha.update(chunk)
+                crc = zlib.crc32(chunk, crc)
+        return sha.hexdigest(), crc
+
+    def _stream_with_hash(self, fsrc, fdst) -> tuple[str, int]:
+        """以固定大小的緩衝區串流複製，同時計算 SHA-256 與 CRC32"""
+        sha = hashlib.sha256()
+        crc = 0
+        while True:
+            chunk = fsrc.read(COPY_BUFFER_SIZE)
+            if not chunk:
+                break
+            sha.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+            fdst.write(chunk)
+        return sha.hexdigest(), crc
     
+    def _gameinfo_unchanged(self, st: os.stat_result) -> bool:
+        """gameinfo.gi 的大小與修改時間是否與上次確認已啟用繁體中文時相同"""
+        state = self._read_json_file(self.gameinfo_state_path)
+        return state.get('size') == st.st_size and state.get('mtime_ns') == st.st_mtime_ns
+
+    def _remember_gameinfo(self) -> None:
+        """記錄已啟用繁體中文的 gameinfo.gi 狀態"""
+        try:
+            st = self.gameinfo_path.stat()
+            self.download_dir.mkdir(exist_ok=True)
+            self._write_json_atomic(self.gameinfo_state_path, {'size': st.st_size, 'mtime_ns': st.st_mtime_ns})
+        except OSError as e:
+            logger.warning(f"無法記錄 gameinfo.gi 狀態: {str(e)}")
+
+    def _read_gameinfo(self) -> tuple[str, 'keyvalues.Node | None']:
+        """讀取 gameinfo.gi 原文（保留換行字元）並找出 SupportedLanguages 區段"""
+        with open(self.gameinfo_path, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        return content, keyvalues.find_block(keyvalues.parse(content), "SupportedLanguages")
+
+    def is_gameinfo_patched(self) -> bool:
+        """gameinfo.gi 是否已啟用繁體中文"""
+        try:
+            if self._gameinfo_unchanged(self.gameinfo_path.stat()):
+                return True
+            _, languages = self._read_gameinfo()
+        except (OSError, ValueError):
+            return False
+        return languages is not None and languages.get(GAMEINFO_LANGUAGE) == GAMEINFO_LANGUAGE_FLAGS
+
     def update_gameinfo_language(self) -> bool:
-        """更新 gameinfo.gi 添加繁體中文語言支援"""
+        """更新 gameinfo.gi 添加繁體中文語言支援
+
+        以 KeyValues 解析找出 SupportedLanguages 區段，只加入或修改 "tchinese" 這一項，
+        不依賴其他語言的順序，其餘內容與格式不變。檔案自上次修改後沒有變動時不需讀取。
+        """
         try:
-            gameinfo_path = self.deadlock_path / "game" / "citadel" / "gameinfo.gi"
-            
-            if not gameinfo_path.exists():
+            gameinfo_path = self.gameinfo_path
+            try:
+                st = gameinfo_path.stat()
+            except FileNotFoundError:
                 logger.warning(f"找不到 gameinfo.gi: {gameinfo_path}")
                 return False
-            
-            logger.info(f"開始修改 gameinfo.gi: {gameinfo_path}")
-            
-            # 讀取檔案
-            with open(gameinfo_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # 搜尋 SupportedLanguages 段落
-            # 查找最後一個語言項目之後的位置，並在 } 之前插入繁體中文
-            
-            # 模式: 在 SupportedLanguages 的 } 之前插入 "tchinese" "3"
-            pattern = r'(SupportedLanguages\s*\{[^}]*"ukrainian"\s*"3")\s*(\})'
-            replacement = r'\1\n\t\t"tchinese" "3"\n\t\2'
-            
-            new_content = re.sub(pattern, replacement, content, flags=re.DOTALL)
-            
-            # 檢查是否已經有 tchinese
-            if '"tchinese"' in new_content and '"tchinese"' not in content:
-                # 成功添加
-                with open(gameinfo_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
-                logger.info("成功在 gameinfo.gi 中添加繁體中文語言支援")
+
+            if self._gameinfo_unchanged(st):
+                logger.info("gameinfo.gi 自上次修改後沒有變動，略過")
                 return True
-            elif '"tchinese"' in content:
+
+            content, languages = self._read_gameinfo()
+            if languages is None:
+                logger.warning("gameinfo.gi 中找不到 SupportedLanguages 區段，未能添加繁體中文語言支援")
+                return False
+
+            if languages.get(GAMEINFO_LANGUAGE) == GAMEINFO_LANGUAGE_FLAGS:
                 logger.info("gameinfo.gi 中已存在繁體中文語言支援")
-                return True
             else:
-                logger.warning("未能在 gameinfo.gi 中添加繁體中文語言支援")
-                return False
-            
+                logger.info(f"開始修改 gameinfo.gi: {gameinfo_path}")
+                new_content = keyvalues.set_value(content, languages, GAMEINFO_LANGUAGE, GAMEINFO_LANGUAGE_FLAGS)
+                # 先寫暫存檔再取代，避免留下不完整的 gameinfo.gi 導致遊戲無法啟動
+                tmp_path = gameinfo_path.with_name(gameinfo_path.name + '.tmp')
+                with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                    f.write(new_content)
+                os.replace(tmp_path, gameinfo_path)
+                self.timings.add(bytes_written=len(new_content.encode('utf-8')), files_touched=1)
+                logger.info("成功在 gameinfo.gi 中添加繁體中文語言支援")
+
+            self._remember_gameinfo()
+            return True
+
         except Exception as e:
             logger.error(f"修改 gameinfo.gi 失敗: {str(e)}")
             return False